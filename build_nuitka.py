@@ -54,7 +54,7 @@ def build_with_nuitka():
         # 明確包含的模組 (避免遺漏)
         "--include-module=config",
         "--include-module=parsers", 
-        "--include-module=statistics",
+        "--include-module=stats_utils",
         "--include-module=widgets",
         "--include-module=workers",
         "--include-package=pdfplumber",
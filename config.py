@@ -3,6 +3,7 @@
 Measurement Analyzer - 設定常數模組
 集中管理所有應用程式設定與常數
 """
+import os
 from dataclasses import dataclass
 
 
@@ -14,6 +15,9 @@ class AppConfig:
     LOG_FILENAME: str = "measurement_analyzer.log"
     THEME_CONFIG_FILE: str = "theme_config.txt"
     DEFAULT_TARGET_YIELD: float = 0.90  # 預設目標良率 90%
+    CACHE_DIR: str = os.path.join(os.path.expanduser("~"), ".cache", "measurement_analyzer")
+    # 解析/判定邏輯或快取欄位格式變更時必須遞增，舊的 Feather 快取即自動失效 (與 VERSION 無關)
+    CACHE_VERSION: int = 3
     
     class Columns:
         """資料欄位名稱"""
@@ -49,6 +53,12 @@ DISPLAY_COLUMNS = [
     AppConfig.Columns.RESULT
 ]
 
+# 重複值多的文字欄位，合併後轉為 Categorical 以節省記憶體並加速比較
+CATEGORICAL_COLUMNS = [
+    AppConfig.Columns.RESULT, AppConfig.Columns.UNIT, 
+    AppConfig.Columns.FILE, AppConfig.Columns.PROJECT, AppConfig.Columns.NO
+]
+
 # 版本更新紀錄
 UPDATE_LOG = """
 === 版本更新紀錄 ===
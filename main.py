@@ -5,27 +5,25 @@ Measurement Analyzer - 主程式入口
 """
 import sys
 import os
-import glob
 import logging
+import multiprocessing
 import pandas as pd
 import numpy as np
-from datetime import datetime
 
 # PyQt6 imports
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHeaderView, QProgressBar, QMessageBox, QGroupBox, QCheckBox, 
                              QInputDialog, QAbstractItemView, QTabWidget, QHBoxLayout, 
-                             QPushButton, QLabel, QFileDialog, QTableWidget, QTableWidgetItem,
+                             QPushButton, QLabel, QFileDialog, QTableView,
                              QDialog, QTextEdit)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor, QBrush
+from PyQt6.QtCore import Qt, QTimer
 
 # Internal imports
-from config import AppConfig, DISPLAY_COLUMNS
-from statistics import calculate_cpk, calculate_tolerance_for_yield
+from config import AppConfig, CATEGORICAL_COLUMNS
+from stats_utils import calculate_cpk_vectorized, calculate_tolerance_for_yield_vectorized
 from parsers import natural_keys, HAS_PDF_SUPPORT
-from widgets import NumericTableWidgetItem, VersionDialog, DistributionPlotDialog, XYScatterPlotDialog, ArrayHeatmapDialog, FileTreeWidget
-from workers import FileLoaderThread
+from widgets import RawDataTableModel, StatsTableModel, NaturalSortProxyModel, VersionDialog, DistributionPlotDialog, XYScatterPlotDialog, ArrayHeatmapDialog, FileTreeWidget
+from workers import FileLoaderThread, CsvExportThread, clear_cache, HAS_PYARROW
 from xy_analyzer import classify_project_name, MeasurementType, get_xy_group_id
 
 # Optional Theme Support
@@ -57,6 +55,7 @@ def setup_logging():
         ]
     )
     logging.getLogger("pdfminer").setLevel(logging.ERROR)
+    logging.getLogger("pdfplumber").setLevel(logging.WARNING)
     logging.getLogger("matplotlib").setLevel(logging.WARNING)
     
     # Encoding Verification
@@ -70,6 +69,17 @@ def setup_logging():
     logging.info(f"應用程式啟動 - {AppConfig.TITLE}")
 
 
+def natural_order(values):
+    """回傳依自然排序排列的位置清單 (natsort 優先，否則使用 natural_keys)"""
+    if HAS_NATSORT:
+        try:
+            return index_natsorted(values, alg=ns.IGNORECASE)
+        except Exception as e:
+            logging.warning(f"Natsort failed, using fallback: {e}")
+    keys = [natural_keys(v) for v in values]
+    return sorted(range(len(keys)), key=keys.__getitem__)
+
+
 class MeasurementAnalyzerApp(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -78,14 +88,80 @@ class MeasurementAnalyzerApp(QMainWindow):
             logging.warning("未安裝 natsort 套件，建議執行: pip install natsort")
         self.setWindowTitle(AppConfig.TITLE)
         self.setGeometry(100, 100, 1300, 850)
-        self.all_data = pd.DataFrame()
+        self._data_chunks = []          # 每批載入的資料，延遲到實際讀取時才合併
+        self._all_data_cache = None
+        self._fail_mask = None          # 隨 all_data 快取建立
+        self._data_version = 0          # 資料每次變動時遞增，作為衍生快取的失效依據
+        self._group_cache = None
+        self._stats_key = None          # 產生目前 stats_data 的 (資料版本, 合併 2D 選項)
         self.stats_data = pd.DataFrame()
         self.loaded_files = set()
         self.loader_thread = None
+        self._pending_frames = {}       # 載入中已完成的檔案 {檔案順序: DataFrame}
+        self.export_thread = None
+        self.dist_dialog = None
         self.current_theme = 'light'
         self.init_theme()
         self.init_ui()
 
+    @property
+    def all_data(self):
+        """所有已載入資料 (合併結果快取至下次新增/移除資料)"""
+        if self._all_data_cache is None:
+            if self._data_chunks:
+                if len(self._data_chunks) == 1:
+                    df = self._data_chunks[0]
+                else:
+                    df = pd.concat(self._data_chunks, ignore_index=True, copy=False)
+                for c in CATEGORICAL_COLUMNS:
+                    if c in df.columns and not isinstance(df[c].dtype, pd.CategoricalDtype):
+                        df[c] = df[c].astype('category')
+                # 合併後只保留轉為 category 的結果，批次清單不再持有另一份 object 欄位資料
+                self._data_chunks = [df]
+                self._all_data_cache = df
+                self._fail_mask = self._build_fail_mask(df)
+            else:
+                self._all_data_cache = pd.DataFrame()
+                self._fail_mask = np.zeros(0, dtype=bool)
+        return self._all_data_cache
+
+    @property
+    def fail_mask(self):
+        """判定結果為 FAIL 的布林遮罩 (與 all_data 快取一同建立)"""
+        _ = self.all_data  # 快取失效時一併重建遮罩
+        return self._fail_mask
+
+    @staticmethod
+    def _build_fail_mask(df):
+        result = df[AppConfig.Columns.RESULT]
+        if isinstance(result.dtype, pd.CategoricalDtype):
+            # 類別欄位直接比對整數代碼，不需逐列比較字串
+            fail_code = result.cat.categories.get_indexer(['FAIL'])[0]
+            if fail_code < 0: return np.zeros(len(df), dtype=bool)
+            return result.cat.codes.to_numpy() == fail_code
+        return (result == 'FAIL').to_numpy()
+
+    @all_data.setter
+    def all_data(self, df):
+        self._data_chunks = [df] if not df.empty else []
+        self._invalidate_data_cache()
+
+    def _invalidate_data_cache(self):
+        self._all_data_cache = None
+        self._data_version += 1
+
+    def _grouping(self):
+        """
+        依 (No, 測量專案) 分組的 groupby 物件與各組列位置，資料版本不變時重複使用
+        Returns: (grouped, indices, indices_by_text) - indices_by_text 以 (str(No), 測量專案) 為鍵，供表格點選時查詢
+        """
+        if self._group_cache is None or self._group_cache[0] != self._data_version:
+            grouped = self.all_data.groupby([AppConfig.Columns.NO, AppConfig.Columns.PROJECT], observed=True)
+            indices = grouped.indices
+            indices_by_text = {(str(no), name): idx for (no, name), idx in indices.items()}
+            self._group_cache = (self._data_version, grouped, indices, indices_by_text)
+        return self._group_cache[1:]
+
     def init_theme(self):
         if not HAS_THEME_SUPPORT: return
         try:
@@ -109,6 +185,8 @@ class MeasurementAnalyzerApp(QMainWindow):
                 return
             self.loader_thread.stop()
             self.loader_thread.wait()
+        if self.export_thread and self.export_thread.isRunning():
+            self.export_thread.wait()  # 確保匯出檔案完整寫入
         event.accept()
 
     def toggle_theme(self):
@@ -142,6 +220,10 @@ class MeasurementAnalyzerApp(QMainWindow):
         self.btn_clear.setStyleSheet("color: red;")
         self.btn_clear.setShortcut("Ctrl+D")
         
+        self.btn_clear_cache = QPushButton("清除快取")
+        self.btn_clear_cache.clicked.connect(self.clear_file_cache)
+        self.btn_clear_cache.setEnabled(HAS_PYARROW)
+        
         self.btn_export = QPushButton("匯出當前頁面資料")
         self.btn_export.clicked.connect(self.export_current_tab)
         self.btn_export.setMinimumHeight(40)
@@ -157,6 +239,7 @@ class MeasurementAnalyzerApp(QMainWindow):
         
         control_layout.addWidget(self.btn_add, 1)
         control_layout.addWidget(self.btn_clear)
+        control_layout.addWidget(self.btn_clear_cache)
         control_layout.addWidget(self.btn_export, 1)
         control_layout.addWidget(self.btn_theme)
         control_layout.addWidget(self.btn_version)
@@ -206,11 +289,15 @@ class MeasurementAnalyzerApp(QMainWindow):
         filter_layout.addWidget(self.btn_plot_raw)
         layout.addLayout(filter_layout)
 
-        self.raw_table = QTableWidget()
-        self.raw_table.setColumnCount(len(DISPLAY_COLUMNS))
-        self.raw_table.setHorizontalHeaderLabels(DISPLAY_COLUMNS)
-        self.raw_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.raw_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        # 以 Model/View 顯示原始數據，避免逐格建立 QTableWidgetItem
+        self.raw_model = RawDataTableModel(self)
+        self.raw_table = QTableView()
+        # 原始數據量大，由模型自行以 numpy 排序，不經過 QSortFilterProxyModel
+        self.raw_table.setModel(self.raw_model)
+        self.raw_table.setSortingEnabled(True)
+        self.raw_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)  # 預設維持載入順序
+        self.raw_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.raw_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.raw_table.setAlternatingRowColors(True)
         header = self.raw_table.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
@@ -244,15 +331,17 @@ class MeasurementAnalyzerApp(QMainWindow):
         
         layout.addLayout(control_layout)
 
-        self.stats_table = QTableWidget()
-        # [v2.5.1] Added Upper/Lower columns
-        cols = ["No", "測量專案", "類型", "樣本數", "NG數", "不良率(%)", "CPK", "上限公差", "下限公差", "建議公差(90%)", "平均值", "最大值", "最小值"]
-        self.stats_table.setColumnCount(len(cols))
-        self.stats_table.setHorizontalHeaderLabels(cols)
-        self.stats_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.stats_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        # 以 Model/View 顯示統計結果，避免逐格建立 QTableWidgetItem
+        self.stats_model = StatsTableModel(self)
+        self.stats_proxy = NaturalSortProxyModel(self)
+        self.stats_proxy.setSourceModel(self.stats_model)
+        self.stats_table = QTableView()
+        self.stats_table.setModel(self.stats_proxy)
+        self.stats_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.stats_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.stats_table.setAlternatingRowColors(True)
         self.stats_table.setSortingEnabled(True)
+        self.stats_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)  # 預設維持自然排序結果
         self.stats_table.doubleClicked.connect(self.plot_from_stats_table)
         
         header = self.stats_table.horizontalHeader()
@@ -272,14 +361,25 @@ class MeasurementAnalyzerApp(QMainWindow):
         folder_path = QFileDialog.getExistingDirectory(self, "選擇資料夾")
         if not folder_path: return
         
-        csv_files = glob.glob(os.path.join(folder_path, "*.csv"))
-        pdf_files = glob.glob(os.path.join(folder_path, "*.pdf"))
+        # 單次 scandir 依副檔名分類，同時記下主檔名供重複比對
+        csv_entries, pdf_entries = [], []  # [(path, base_name), ...]
+        with os.scandir(folder_path) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith('.') or not entry.is_file(): continue
+                ext = name[-4:].lower()
+                if ext == '.csv':
+                    csv_entries.append((entry.path, name[:-4]))
+                elif ext == '.pdf':
+                    pdf_entries.append((entry.path, name[:-4]))
+        csv_files = [path for path, _ in csv_entries]
+        pdf_files = [path for path, _ in pdf_entries]
         
         files_to_load = csv_files + pdf_files
         
         if csv_files and pdf_files and HAS_PDF_SUPPORT:
-            csv_bases = {os.path.splitext(os.path.basename(f))[0] for f in csv_files}
-            pdf_bases = {os.path.splitext(os.path.basename(f))[0] for f in pdf_files}
+            csv_bases = {base for _, base in csv_entries}
+            pdf_bases = {base for _, base in pdf_entries}
             duplicates = csv_bases.intersection(pdf_bases)
             
             if duplicates:
@@ -292,10 +392,10 @@ class MeasurementAnalyzerApp(QMainWindow):
                     if "忽略所有 PDF" in item:
                         files_to_load = csv_files
                     elif "CSV" in item:
-                        pdf_unique = [f for f in pdf_files if os.path.splitext(os.path.basename(f))[0] not in csv_bases]
+                        pdf_unique = [path for path, base in pdf_entries if base not in csv_bases]
                         files_to_load = csv_files + pdf_unique
                     elif "PDF" in item:
-                        csv_unique = [f for f in csv_files if os.path.splitext(os.path.basename(f))[0] not in pdf_bases]
+                        csv_unique = [path for path, base in csv_entries if base not in pdf_bases]
                         files_to_load = csv_unique + pdf_files
                     else:
                         files_to_load = csv_files + pdf_files
@@ -311,8 +411,10 @@ class MeasurementAnalyzerApp(QMainWindow):
         self.progress_bar.setMaximum(len(files_to_load))
         self.progress_bar.setValue(0)
 
+        self._pending_frames = {}
         self.loader_thread = FileLoaderThread(files_to_load)
         self.loader_thread.progress_updated.connect(self.on_progress_updated)
+        self.loader_thread.file_ready.connect(self.on_file_ready)
         self.loader_thread.data_loaded.connect(self.on_data_loaded)
         self.loader_thread.start()
         
@@ -328,17 +430,28 @@ class MeasurementAnalyzerApp(QMainWindow):
         self.progress_bar.setValue(value)
         self.lbl_info.setText(message)
 
+    def on_file_ready(self, index, df):
+        """單一檔案解析完成：先行接收資料，背景執行緒不必保留整批結果"""
+        self._pending_frames[index] = df
+
     def on_data_loaded(self, new_data_frames, loaded_filenames, errors):
         import time
         start_time = time.time()
         
+        # 逐檔接收的資料依原始檔案順序排列，與完成順序無關
+        if self._pending_frames:
+            pending = self._pending_frames
+            self._pending_frames = {}
+            new_data_frames = list(new_data_frames) + [pending[i] for i in sorted(pending)]
+        
         self.loaded_files.update(loaded_filenames)
         if new_data_frames:
             self.lbl_info.setText("正在合併資料...")
             QApplication.processEvents() 
             new_data = pd.concat(new_data_frames, ignore_index=True)
-            if self.all_data.empty: self.all_data = new_data
-            else: self.all_data = pd.concat([self.all_data, new_data], ignore_index=True)
+            # 只累積批次清單，避免每次載入都複製整份既有資料
+            self._data_chunks.append(new_data)
+            self._invalidate_data_cache()
             
             self.btn_export.setEnabled(True)
             self.chk_only_fail.setEnabled(True)
@@ -423,134 +536,130 @@ class MeasurementAnalyzerApp(QMainWindow):
             self.all_data = pd.DataFrame()
             self.stats_data = pd.DataFrame()
             self.loaded_files.clear()
-            self.raw_table.setRowCount(0)
-            self.stats_table.setRowCount(0)
+            self.raw_model.set_dataframe(pd.DataFrame())
+            self.stats_model.set_dataframe(pd.DataFrame())
             self.lbl_status.setText("資料已清空")
             self.lbl_stats_summary.setText("資料已清空")
             self.chk_only_fail.setEnabled(False)
             self.btn_export.setEnabled(False)
             self.file_tree.clear() # [v2.5.1] Clear tree
 
+    def clear_file_cache(self):
+        """刪除已解析檔案的磁碟快取 (下次加入檔案時重新解析)"""
+        removed = clear_cache()
+        self.lbl_info.setText(f"已清除快取: {removed} 個檔案")
+
     def refresh_raw_table(self):
-        if self.all_data.empty: return
-        df_to_show = self.all_data[self.all_data[AppConfig.Columns.RESULT] == 'FAIL'] if self.chk_only_fail.isChecked() else self.all_data
-        
-        MAX_DISPLAY = 5000 
-        rows = min(len(df_to_show), MAX_DISPLAY)
-        self.raw_table.setRowCount(rows)
-        self.raw_table.setSortingEnabled(False)
-        
-        red_brush = QBrush(QColor(255, 220, 220))
-        red_text = QColor(200, 0, 0)
-        green_text = QColor(0, 128, 0)
-        
-        col_indices = [df_to_show.columns.get_loc(c) for c in DISPLAY_COLUMNS if c in df_to_show.columns]
-        
-        for r in range(rows):
-            is_fail = str(df_to_show.iloc[r][AppConfig.Columns.RESULT]) == "FAIL"
-            for table_c, df_c in enumerate(col_indices):
-                val = df_to_show.iloc[r, df_c]
-                item_text = ""
-                if table_c == 1 and isinstance(val, (datetime, pd.Timestamp)):
-                    item_text = val.strftime("%Y/%m/%d %H:%M:%S") if pd.notnull(val) else ""
-                else:
-                    item_text = f"{val:.4f}" if isinstance(val, float) else str(val)
-                
-                # Use NumericTableWidgetItem for numeric columns
-                if DISPLAY_COLUMNS[table_c] in [AppConfig.Columns.NO, AppConfig.Columns.MEASURED, AppConfig.Columns.DESIGN, AppConfig.Columns.DIFF, AppConfig.Columns.UPPER, AppConfig.Columns.LOWER]:
-                    item = NumericTableWidgetItem(item_text)
-                else:
-                    item = QTableWidgetItem(item_text)
-
-                if is_fail:
-                    if DISPLAY_COLUMNS[table_c] in [AppConfig.Columns.DIFF, AppConfig.Columns.RESULT]:
-                        item.setForeground(red_text)
-                        item.setBackground(red_brush)
-                elif item_text == "OK" and DISPLAY_COLUMNS[table_c] == AppConfig.Columns.RESULT:
-                    item.setForeground(green_text)
-                self.raw_table.setItem(r, table_c, item)
-        self.raw_table.setSortingEnabled(True)
-        status = f"Raw Data: {len(df_to_show)} 筆 | 總樣本: {len(self.loaded_files)}"
-        if len(df_to_show) > MAX_DISPLAY: status += " (僅顯示前5000筆)"
-        self.lbl_status.setText(status)
+        if self.all_data.empty:
+            self.raw_model.set_dataframe(pd.DataFrame())
+            return
+        if self.chk_only_fail.isChecked():
+            row_idx = np.flatnonzero(self.fail_mask)
+        else:
+            row_idx = np.arange(len(self.all_data))
+        
+        # Model 只持有列索引陣列，列數隨捲動以 fetchMore 分批開放，不再截斷顯示筆數
+        self.raw_table.setUpdatesEnabled(False)
+        try:
+            # 已設定排序欄時由模型於重設時一併重新排序
+            self.raw_model.set_dataframe(self.all_data, row_idx)
+        finally:
+            self.raw_table.setUpdatesEnabled(True)
+        self.lbl_status.setText(f"Raw Data: {len(row_idx)} 筆 | 總樣本: {len(self.loaded_files)}")
 
     def calculate_and_refresh_stats(self):
         if self.all_data.empty: return
+        merge_2d = self.chk_merge_2d.isChecked()
+        # 資料與合併選項皆未變動時沿用上次的統計結果
+        stats_key = (self._data_version, merge_2d)
+        if stats_key == self._stats_key and not self.stats_data.empty: return
         self.lbl_info.setText("正在計算統計數據...")
         total_files = len(self.loaded_files)
-        grouped = self.all_data.groupby([AppConfig.Columns.NO, AppConfig.Columns.PROJECT])
-        
-        # [v2.5.0] 合併 2D XY 座標顯示邏輯
-        merge_2d = self.chk_merge_2d.isChecked()
-        processed_xy_groups = set()  # 已處理的 XY 座標組
+        data = self.all_data
+        grouped, group_indices, _ = self._grouping()
+        
+        # 一次聚合所有測項的基本統計量 (取代逐組切片計算)
+        agg = grouped[AppConfig.Columns.MEASURED].agg(['count', 'mean', 'max', 'min', 'std'])
+        codes = grouped.ngroup().to_numpy()
+        valid_pos = np.flatnonzero(codes >= 0)
+        valid_codes = codes[valid_pos]
+        n_groups = len(agg)
+        sizes = np.bincount(valid_codes, minlength=n_groups)
+        is_fail = self.fail_mask
+        ng_counts = np.bincount(valid_codes, weights=is_fail[valid_pos], minlength=n_groups).astype(int)
+        # 每組第一列的設計值與公差
+        _, first_idx = np.unique(valid_codes, return_index=True)
+        first_rows = valid_pos[first_idx]
+        designs = data[AppConfig.Columns.DESIGN].to_numpy()[first_rows]
+        uppers = data[AppConfig.Columns.UPPER].to_numpy()[first_rows]
+        lowers = data[AppConfig.Columns.LOWER].to_numpy()[first_rows]
+        
+        counts = agg['count'].to_numpy()
+        cpks, cpk_reliabilities = calculate_cpk_vectorized(
+            counts, agg['mean'].to_numpy(), agg['std'].to_numpy(),
+            designs + uppers, designs + lowers)
+        # [v2.3.0] 計算建議公差 (以聚合後的平均值與標準差一次計算所有測項)
+        tol_result = calculate_tolerance_for_yield_vectorized(
+            counts, agg['mean'].to_numpy(), agg['std'].to_numpy(), designs, AppConfig.DEFAULT_TARGET_YIELD)
+        nos = agg.index.get_level_values(0).to_numpy(dtype=object)
+        names = agg.index.get_level_values(1).to_numpy(dtype=object)
+        
+        # [v2.5.0] 分類測量類型
+        classified = [classify_project_name(name) for name in names]
+        type_labels = np.array([type_info.value for type_info, _, _ in classified], dtype=object)
+        
+        # [v2.5.0] 合併 2D XY 座標顯示邏輯：勾選時獨立 X/Y 不列出，收集後另行計算合併統計
+        is_merged_xy = np.fromiter((merge_2d and type_info == MeasurementType.XY_COORD
+                                    for type_info, _, _ in classified), dtype=bool, count=len(classified))
         xy_group_data = {}  # 收集 XY 座標組資料用於合併統計
-        
-        stats_list = []
-        for (no, name), group in grouped:
-            # [v2.5.0] 分類測量類型
-            type_info, group_id, axis = classify_project_name(name)
-            type_label = type_info.value
-            
-            # 若勾選合併 2D，收集 XY 資料稍後處理
-            if merge_2d and type_info == MeasurementType.XY_COORD:
-                if group_id not in xy_group_data:
-                    xy_group_data[group_id] = {'x_group': None, 'y_group': None, 'no': no}
-                if axis == 'X':
-                    xy_group_data[group_id]['x_group'] = group
-                else:
-                    xy_group_data[group_id]['y_group'] = group
-                continue  # 跳過獨立 X/Y，稍後處理合併
-            
-            count = len(group)
-            ng_count = len(group[group[AppConfig.Columns.RESULT] == 'FAIL'])
-            fail_rate = (ng_count / total_files) * 100 if total_files > 0 else 0
-            vals = pd.to_numeric(group[AppConfig.Columns.MEASURED], errors='coerce').dropna()
-            
-            first = group.iloc[0]
-            design = float(first.get(AppConfig.Columns.DESIGN, 0))
-            upper = float(first.get(AppConfig.Columns.UPPER, 0))
-            lower = float(first.get(AppConfig.Columns.LOWER, 0))
-            usl = design + upper
-            lsl = design + lower
-            
-            mean_val = vals.mean() if not vals.empty else 0
-            max_val = vals.max() if not vals.empty else 0
-            min_val = vals.min() if not vals.empty else 0
-            
-            cpk, reliability = calculate_cpk(vals, usl, lsl)
-            
-            # [v2.3.0] 計算建議公差
-            tol_result = calculate_tolerance_for_yield(vals, design, AppConfig.DEFAULT_TARGET_YIELD)
-            
-            stats_list.append({
-                "No": no, "測量專案": name, "類型": type_label, "樣本數": count, 
-                "NG數": ng_count, "不良率(%)": fail_rate, "CPK": cpk,
-                "CPK_RELIABILITY": reliability,
-                "建議公差": tol_result['symmetric_tol'],
-                "TOL_RELIABILITY": tol_result['reliability'],
-                "TOL_UPPER": tol_result['upper_tol'],
-                "TOL_LOWER": tol_result['lower_tol'],
-                "TOL_OFFSET": tol_result['offset'],
-                "平均值": mean_val, "最大值": max_val, "最小值": min_val,
-                "_design": design, "_upper": upper, "_lower": lower
-            })
+        for i in np.flatnonzero(is_merged_xy):
+            _, group_id, axis = classified[i]
+            no, name = nos[i], names[i]
+            if group_id not in xy_group_data:
+                xy_group_data[group_id] = {'x_group': None, 'y_group': None, 'no': no}
+            group = data.iloc[group_indices[(no, name)]]
+            if axis == 'X':
+                xy_group_data[group_id]['x_group'] = group
+            else:
+                xy_group_data[group_id]['y_group'] = group
+        
+        keep = ~is_merged_xy
+        fail_rates = (ng_counts / total_files) * 100 if total_files > 0 else np.zeros(n_groups)
+        stats_frames = [pd.DataFrame({
+            "No": nos[keep], "測量專案": names[keep], "類型": type_labels[keep], "樣本數": sizes[keep],
+            "NG數": ng_counts[keep], "不良率(%)": fail_rates[keep], "CPK": cpks[keep],
+            "CPK_RELIABILITY": cpk_reliabilities[keep],
+            "建議公差": tol_result['symmetric_tol'][keep],
+            "TOL_RELIABILITY": tol_result['reliability'][keep],
+            "TOL_UPPER": tol_result['upper_tol'][keep],
+            "TOL_LOWER": tol_result['lower_tol'][keep],
+            "TOL_OFFSET": tol_result['offset'][keep],
+            "平均值": agg['mean'].fillna(0).to_numpy()[keep],
+            "最大值": agg['max'].fillna(0).to_numpy()[keep],
+            "最小值": agg['min'].fillna(0).to_numpy()[keep],
+            "_design": designs[keep], "_upper": uppers[keep], "_lower": lowers[keep]
+        })]
         
         # [v2.5.0] 處理合併 XY 座標組統計
+        merged_rows = []
         if merge_2d and xy_group_data:
             from xy_analyzer import calculate_radial_deviation, calculate_radial_tolerance
             
-            for group_id, data in xy_group_data.items():
-                x_group = data.get('x_group')
-                y_group = data.get('y_group')
+            for group_id, xy in xy_group_data.items():
+                x_group = xy.get('x_group')
+                y_group = xy.get('y_group')
                 
                 if x_group is None or y_group is None:
                     continue
                 
-                # 按檔案配對計算徑向偏差
-                x_by_file = {row[AppConfig.Columns.FILE]: row for _, row in x_group.iterrows()}
-                y_by_file = {row[AppConfig.Columns.FILE]: row for _, row in y_group.iterrows()}
+                # 按檔案配對計算徑向偏差 (itertuples 直接取得 (實測值, 設計值, 上限公差)，不必逐列建立 Series)
+                pair_cols = [AppConfig.Columns.FILE, AppConfig.Columns.MEASURED, AppConfig.Columns.DESIGN, AppConfig.Columns.UPPER]
+                x_by_file = {f: vals for f, *vals in x_group[pair_cols].itertuples(index=False, name=None)}
+                y_by_file = {f: vals for f, *vals in y_group[pair_cols].itertuples(index=False, name=None)}
                 
-                radial_devs = []
+                # 配對數不超過 X 的檔案數，預先配置徑向偏差緩衝區，最後只取已寫入的部分
+                radial_devs = np.empty(len(x_by_file), dtype=np.float64)
+                count = 0
                 ng_count = 0
                 first_row = None
                 
@@ -560,10 +669,8 @@ class MeasurementAnalyzerApp(QMainWindow):
                     y_row = y_by_file[file_name]
                     first_row = x_row  # 用於取得公差等資訊
                     
-                    x_val = pd.to_numeric(x_row.get(AppConfig.Columns.MEASURED), errors='coerce')
-                    x_design = pd.to_numeric(x_row.get(AppConfig.Columns.DESIGN), errors='coerce')
-                    y_val = pd.to_numeric(y_row.get(AppConfig.Columns.MEASURED), errors='coerce')
-                    y_design = pd.to_numeric(y_row.get(AppConfig.Columns.DESIGN), errors='coerce')
+                    x_val, x_design, upper_tol = x_row
+                    y_val, y_design, _ = y_row
                     
                     if any(np.isnan([x_val, x_design, y_val, y_design])):
                         continue
@@ -571,20 +678,19 @@ class MeasurementAnalyzerApp(QMainWindow):
                     dx = x_val - x_design
                     dy = y_val - y_design
                     radial = calculate_radial_deviation(dx, dy)
-                    radial_devs.append(radial)
+                    radial_devs[count] = radial
+                    count += 1
                     
                     # 判定徑向是否超標
-                    upper_tol = pd.to_numeric(x_row.get(AppConfig.Columns.UPPER), errors='coerce')
                     radial_tol = calculate_radial_tolerance(upper_tol, upper_tol)
                     if not np.isnan(radial_tol) and radial > radial_tol:
                         ng_count += 1
                 
-                if not radial_devs:
+                if count == 0:
                     continue
                 
                 # 計算統計
-                count = len(radial_devs)
-                radial_arr = np.array(radial_devs)
+                radial_arr = radial_devs[:count]
                 mean_radial = radial_arr.mean()
                 max_radial = radial_arr.max()
                 min_radial = radial_arr.min()
@@ -602,8 +708,8 @@ class MeasurementAnalyzerApp(QMainWindow):
                 sugg_tol = sugg_result.get('suggested_tol', np.nan)
                 
                 # 加入合併後的統計
-                stats_list.append({
-                    "No": data['no'],
+                merged_rows.append({
+                    "No": xy['no'],
                     "測量專案": f"{group_id} (2D合併)",
                     "類型": "2D",
                     "樣本數": count,
@@ -623,27 +729,22 @@ class MeasurementAnalyzerApp(QMainWindow):
                     "最大值": max_radial,
                     "最小值": min_radial,
                     "_design": 0,
-                    "_upper": pd.to_numeric(first_row.get(AppConfig.Columns.UPPER), errors='coerce') if first_row is not None else 0,
+                    "_upper": first_row[2] if first_row is not None else 0,
                     "_lower": 0,
                     "_is_merged_2d": True  # 標記為合併項目，用於 Phase 3 展開
                 })
             
-        self.stats_data = pd.DataFrame(stats_list)
-        
-        # [v2.0.3] 使用自然排序 (Natsort)
-        if HAS_NATSORT:
-            try:
-                sorted_idx = index_natsorted(self.stats_data['No'], alg=ns.IGNORECASE)
-                self.stats_data = self.stats_data.iloc[sorted_idx]
-            except Exception as e:
-                logging.warning(f"Natsort failed, using fallback: {e}")
-                self.stats_data['_sort_key'] = self.stats_data['No'].apply(natural_keys)
-                self.stats_data.sort_values(by="_sort_key", inplace=True)
-                self.stats_data.drop(columns=['_sort_key'], inplace=True)
-        else:
-            self.stats_data['_sort_key'] = self.stats_data['No'].apply(natural_keys)
-            self.stats_data.sort_values(by="_sort_key", inplace=True)
-            self.stats_data.drop(columns=['_sort_key'], inplace=True)
+        if merged_rows:
+            stats_frames.append(pd.DataFrame(merged_rows))
+        self.stats_data = pd.concat(stats_frames, ignore_index=True)
+        if not self.stats_data.empty:
+            # 直接取自原始資料 (float32) 的欄位維持 float32，避免匯出時出現 0.05000000074505806 之類的尾數
+            raw_value_cols = ["最大值", "最小值", "_design", "_upper", "_lower"]
+            self.stats_data[raw_value_cols] = self.stats_data[raw_value_cols].astype(np.float32)
+        
+        # [v2.0.3] 使用自然排序 (Natsort)，只計算排列順序，不在 stats_data 加暫存欄位
+        self.stats_data = self.stats_data.iloc[natural_order(self.stats_data['No'].tolist())]
+        self._stats_key = stats_key
         
         total_items = len(self.stats_data)
         ng_items = len(self.stats_data[self.stats_data["NG數"] > 0])
@@ -652,142 +753,27 @@ class MeasurementAnalyzerApp(QMainWindow):
             f"平均良率: {100 - self.stats_data['不良率(%)'].mean():.2f}%"
         )
         
-        self.stats_table.setRowCount(len(self.stats_data))
-        self.stats_table.setSortingEnabled(False)
-        for r in range(len(self.stats_data)):
-            row = self.stats_data.iloc[r]
-            self.stats_table.setItem(r, 0, NumericTableWidgetItem(str(row['No'])))
-            self.stats_table.setItem(r, 1, QTableWidgetItem(str(row['測量專案'])))
-            
-            # [v2.5.0] 類型欄 (1D/2D/陣列)
-            type_item = QTableWidgetItem(str(row.get('類型', '1D')))
-            if row.get('類型') == '2D':
-                type_item.setForeground(QColor('blue'))
-            elif row.get('類型') == '陣列':
-                type_item.setForeground(QColor('purple'))
-            self.stats_table.setItem(r, 2, type_item)
-            
-            self.stats_table.setItem(r, 3, NumericTableWidgetItem(str(row['樣本數'])))
-            
-            ng_item = NumericTableWidgetItem(str(row['NG數']))
-            if row['NG數'] > 0: ng_item.setForeground(QColor('red'))
-            self.stats_table.setItem(r, 4, ng_item)
-            
-            rate_item = NumericTableWidgetItem(f"{row['不良率(%)']:.2f}")
-            if row['不良率(%)'] > 0: rate_item.setForeground(QColor('red'))
-            self.stats_table.setItem(r, 5, rate_item)
-            
-            # CPK Display Logic
-            cpk_val = row['CPK']
-            reliability = row.get('CPK_RELIABILITY', 'reliable')
-            sample_count = row['樣本數']
-            
-            cpk_text = ""
-            cpk_item = NumericTableWidgetItem("")
-            
-            if reliability == 'invalid':
-                cpk_text = "---"
-                cpk_item.setText(cpk_text)
-                cpk_item.setToolTip("無法計算 CPK (數據不足或規格異常)")
-            elif reliability == 'small_sample':
-                cpk_text = f"{cpk_val:.3f} ⚠"
-                cpk_item.setText(cpk_text)
-                cpk_item.setForeground(QColor('darkorange')) # Use orange for warning
-                cpk_item.setToolTip(
-                    "警告：樣本數少於 30，CPK 值僅供參考\n"
-                    f"當前樣本數：{sample_count}\n"
-                    "建議：累積更多數據後再評估製程能力"
-                )
-            else:
-                cpk_text = f"{cpk_val:.3f}"
-                cpk_item.setText(cpk_text)
-                cpk_item.setToolTip(f"CPK: {cpk_val:.3f} (樣本數：{sample_count})")
-                
-                # Color coding for reliable CPK
-                if cpk_val < 1.0: cpk_item.setBackground(QBrush(QColor(255, 200, 200)))
-                elif cpk_val < 1.33: cpk_item.setBackground(QBrush(QColor(255, 255, 200)))
-                else: cpk_item.setBackground(QBrush(QColor(200, 255, 200)))
-
-            self.stats_table.setItem(r, 6, cpk_item)
-
-            # [v2.5.1] New Tolerance Columns
-            # Upper Tolerance
-            up_val = row.get('_upper', 0)
-            self.stats_table.setItem(r, 7, NumericTableWidgetItem(f"{up_val:.4f}"))
-            
-            # Lower Tolerance
-            low_val = row.get('_lower', 0)
-            self.stats_table.setItem(r, 8, NumericTableWidgetItem(f"{low_val:.4f}"))
-            
-            # [v2.3.0] 建議公差 Display Logic (Calculated Index shifted to 9)
-            tol_val = row['建議公差']
-            tol_reliability = row.get('TOL_RELIABILITY', 'invalid')
-            tol_upper = row.get('TOL_UPPER', np.nan)
-            tol_lower = row.get('TOL_LOWER', np.nan)
-            tol_offset = row.get('TOL_OFFSET', np.nan)
-            current_upper = row.get('_upper', 0)
-            current_lower = row.get('_lower', 0)
-            
-            tol_item = NumericTableWidgetItem("")
-            
-            if tol_reliability == 'invalid' or tol_reliability == 'zero_std':
-                tol_item.setText("---")
-                tol_item.setToolTip("無法計算 (數據不足或標準差為零)")
-            else:
-                tol_text = f"±{tol_val:.4f}"
-                if tol_reliability == 'small_sample':
-                    tol_text += " ⚠"
-                    tol_item.setForeground(QColor('darkorange'))
-                
-                tol_item.setText(tol_text)
-                
-                # 詳細 Tooltip
-                tooltip_lines = [
-                    f"【達成 {AppConfig.DEFAULT_TARGET_YIELD*100:.0f}% 良率所需公差】",
-                    f"對稱公差：±{tol_val:.4f}",
-                    f"",
-                    f"📊 非對稱建議：",
-                    f"  上限：+{tol_upper:.4f}",
-                    f"  下限：{tol_lower:.4f}",
-                    f"",
-                    f"📐 當前設定：",
-                    f"  上限：+{current_upper:.4f}",
-                    f"  下限：{current_lower:.4f}",
-                    f"",
-                    f"📈 製程偏移：{tol_offset:+.4f}" if not np.isnan(tol_offset) else ""
-                ]
-                tol_item.setToolTip("\n".join([l for l in tooltip_lines if l]))
-                
-                # 顏色標記：與當前規格比較
-                if not np.isnan(tol_val):
-                    current_tol = max(abs(current_upper), abs(current_lower))
-                    if current_tol > 0:
-                        if tol_val > current_tol * 1.2:  # 建議公差比當前大 20%
-                            tol_item.setBackground(QBrush(QColor(255, 220, 220)))  # 淺紅：規格偏緊
-                        elif tol_val < current_tol * 0.8:  # 建議公差比當前小 20%
-                            tol_item.setBackground(QBrush(QColor(220, 255, 220)))  # 淺綠：規格充裕
-            
-            self.stats_table.setItem(r, 9, tol_item)
-            self.stats_table.setItem(r, 10, NumericTableWidgetItem(f"{row['平均值']:.4f}"))
-            self.stats_table.setItem(r, 11, NumericTableWidgetItem(f"{row['最大值']:.4f}"))
-            self.stats_table.setItem(r, 12, NumericTableWidgetItem(f"{row['最小值']:.4f}"))
-        self.stats_table.setSortingEnabled(True)
+        # 整批重設 Model 期間暫停重繪，避免重設與排序各觸發一次 viewport 更新
+        self.stats_table.setUpdatesEnabled(False)
+        try:
+            self.stats_model.set_dataframe(self.stats_data)
+        finally:
+            self.stats_table.setUpdatesEnabled(True)
         self.lbl_info.setText("統計數據更新完成。")
 
     def plot_from_raw_table(self):
-        sel = self.raw_table.selectedItems()
+        sel = self.raw_table.selectionModel().selectedRows()
         if not sel: return
         row = sel[0].row()
-        target_no = self.raw_table.item(row, 2).text()
-        target_name = self.raw_table.item(row, 3).text()
+        target_no = self.raw_model.index(row, 2).data()
+        target_name = self.raw_model.index(row, 3).data()
         self.open_plot_dialog(target_no, target_name)
 
     def plot_from_stats_table(self):
-        sel = self.stats_table.selectedItems()
+        sel = self.stats_table.selectionModel().selectedRows()
         if not sel: return
-        row = sel[0].row()
-        target_no = self.stats_table.item(row, 0).text()
-        target_name = self.stats_table.item(row, 1).text()
+        row = self.stats_proxy.mapToSource(sel[0]).row()
+        target_no, target_name = self.stats_model.item_key(row)
         self.open_plot_dialog(target_no, target_name)
 
     def open_plot_dialog(self, no, name):
@@ -795,37 +781,24 @@ class MeasurementAnalyzerApp(QMainWindow):
             # [v2.5.0] 檢查是否為陣列類型
             type_info, group_id, sub_info = classify_project_name(name)
             if type_info == MeasurementType.ARRAY:
-                # 收集陣列所有點的資料
-                unique_projects = self.all_data[AppConfig.Columns.PROJECT].unique()
+                # 收集陣列所有點的資料 (顯示平均值)
+                # 有指定 No 時只取該 No 的各組資料；以快取的組索引取值，不逐點掃描整份資料
+                measured = self.all_data[AppConfig.Columns.MEASURED].to_numpy(dtype=float)
+                if no:
+                    _, _, indices_by_text = self._grouping()
+                    candidates = [(proj, idx) for (no_text, proj), idx in indices_by_text.items() if no_text == str(no)]
+                else:
+                    candidates = self.all_data.groupby(AppConfig.Columns.PROJECT, observed=True).indices.items()
                 array_items = []
                 
-                for proj in unique_projects:
-                    t, g, idx = classify_project_name(proj)
+                for proj, idx in candidates:
+                    t, g, point_idx = classify_project_name(proj)
                     if t == MeasurementType.ARRAY and g == group_id:
-                        # 計算該點的統計值 (顯示平均值)
-                        # 限定目前的 No (雖然 No 通常不同檔案相同?) 
-                        # 修正: No 應該是批號? 但主要以 Name 分組
-                        # 這裡假設查看的是整個 DataSet 的平均表現
-                        
-                        mask = (self.all_data[AppConfig.Columns.PROJECT] == proj)
-                        if no: # 如果有點選特定 No，是否要只過濾該 No? 
-                               # 通常 No 是一批資料的 ID. 如果合併多個 CSV，No 可能不同?
-                               # 原始邏輯 open_plot_dialog 傳入 no (如 '59', '60').
-                               # 在 raw_table 中，No 是每一行的 ID. 
-                               # 若要看整體分佈，應該忽略 No，或只看特定 No?
-                               # 統計表是 aggregation. raw table 是 individual.
-                               # open_plot_dialog 其實是用於查看 "Raw Data Row" 的詳情?
-                               # 還是 "Stats Row"?
-                               # 調用來源 plot_from_stats_table 傳入的是 row's No. (Group Key)
-                               # 如果是 groupby(No, Project)，那麼只看該 No 的資料是正確的.
-                            mask &= (self.all_data[AppConfig.Columns.NO].astype(str) == str(no))
-                            
-                        subset = self.all_data[mask]
-                        vals = pd.to_numeric(subset[AppConfig.Columns.MEASURED], errors='coerce').dropna()
-                        
-                        if not vals.empty:
+                        vals = measured[idx]
+                        vals = vals[~np.isnan(vals)]
+                        if len(vals):
                             array_items.append({
-                                'index': idx,
+                                'index': point_idx,
                                 'value': vals.mean(), # 顯示平均值
                                 'file': 'Average'
                             })
@@ -850,21 +823,19 @@ class MeasurementAnalyzerApp(QMainWindow):
                 x_name = f"{group_id}[X座標]"
                 y_name = f"{group_id}[Y座標]"
                 
-                mask_x = (self.all_data[AppConfig.Columns.NO].astype(str) == no) & \
-                         (self.all_data[AppConfig.Columns.PROJECT] == x_name)
-                mask_y = (self.all_data[AppConfig.Columns.NO].astype(str) == no) & \
-                         (self.all_data[AppConfig.Columns.PROJECT] == y_name)
-                
-                df_x = self.all_data[mask_x]
-                df_y = self.all_data[mask_y]
+                _, _, indices_by_text = self._grouping()
+                empty = np.array([], dtype=np.intp)
+                df_x = self.all_data.iloc[indices_by_text.get((no, x_name), empty)]
+                df_y = self.all_data.iloc[indices_by_text.get((no, y_name), empty)]
                 
                 if df_x.empty or df_y.empty:
                     QMessageBox.information(self, "提示", f"找不到 {group_id} 的完整 X/Y 資料")
                     return
                 
-                # 按檔案配對計算徑向偏差
-                x_by_file = {row[AppConfig.Columns.FILE]: row for _, row in df_x.iterrows()}
-                y_by_file = {row[AppConfig.Columns.FILE]: row for _, row in df_y.iterrows()}
+                # 按檔案配對計算徑向偏差 (每檔案保留 (實測值, 設計值, 上限公差))
+                pair_cols = [AppConfig.Columns.FILE, AppConfig.Columns.MEASURED, AppConfig.Columns.DESIGN, AppConfig.Columns.UPPER]
+                x_by_file = {f: vals for f, *vals in df_x[pair_cols].itertuples(index=False, name=None)}
+                y_by_file = {f: vals for f, *vals in df_y[pair_cols].itertuples(index=False, name=None)}
                 
                 radial_data = []
                 first_x_row = None
@@ -875,10 +846,8 @@ class MeasurementAnalyzerApp(QMainWindow):
                     y_row = y_by_file[file_name]
                     first_x_row = x_row
                     
-                    x_val = pd.to_numeric(x_row.get(AppConfig.Columns.MEASURED), errors='coerce')
-                    x_design = pd.to_numeric(x_row.get(AppConfig.Columns.DESIGN), errors='coerce')
-                    y_val = pd.to_numeric(y_row.get(AppConfig.Columns.MEASURED), errors='coerce')
-                    y_design = pd.to_numeric(y_row.get(AppConfig.Columns.DESIGN), errors='coerce')
+                    x_val, x_design, x_upper = x_row
+                    y_val, y_design, _ = y_row
                     
                     if any(np.isnan([x_val, x_design, y_val, y_design])):
                         continue
@@ -894,7 +863,7 @@ class MeasurementAnalyzerApp(QMainWindow):
                         AppConfig.Columns.PROJECT: f"{group_id} (徑向偏差)",
                         AppConfig.Columns.MEASURED: radial,  # 徑向偏差作為實測值
                         AppConfig.Columns.DESIGN: 0,  # 設計值為 0（期望中心點）
-                        AppConfig.Columns.UPPER: x_row.get(AppConfig.Columns.UPPER, 0.05),  # 使用 X 的公差
+                        AppConfig.Columns.UPPER: x_upper,  # 使用 X 的公差
                         AppConfig.Columns.LOWER: 0,  # 徑向偏差為正值
                         AppConfig.Columns.RESULT: 'OK'
                     })
@@ -904,7 +873,7 @@ class MeasurementAnalyzerApp(QMainWindow):
                     return
                 
                 # 取得公差資訊
-                upper_tol = pd.to_numeric(first_x_row.get(AppConfig.Columns.UPPER, 0.05), errors='coerce')
+                upper_tol = first_x_row[2]
                 radial_tol = calculate_radial_tolerance(upper_tol, upper_tol)
                 
                 # [v2.5.0] 建立 XY 數據用於散佈圖
@@ -914,10 +883,8 @@ class MeasurementAnalyzerApp(QMainWindow):
                         continue
                     y_row = y_by_file[file_name]
                     
-                    x_val = pd.to_numeric(x_row.get(AppConfig.Columns.MEASURED), errors='coerce')
-                    x_design = pd.to_numeric(x_row.get(AppConfig.Columns.DESIGN), errors='coerce')
-                    y_val = pd.to_numeric(y_row.get(AppConfig.Columns.MEASURED), errors='coerce')
-                    y_design = pd.to_numeric(y_row.get(AppConfig.Columns.DESIGN), errors='coerce')
+                    x_val, x_design, _ = x_row
+                    y_val, y_design, _ = y_row
                     
                     if any(np.isnan([x_val, x_design, y_val, y_design])):
                         continue
@@ -945,18 +912,21 @@ class MeasurementAnalyzerApp(QMainWindow):
                 plot_dlg.exec()
             else:
                 # 原有邏輯
-                mask = (self.all_data[AppConfig.Columns.NO].astype(str) == no) & \
-                       (self.all_data[AppConfig.Columns.PROJECT] == name)
-                df_item = self.all_data[mask]
-                if df_item.empty: return
+                _, _, indices_by_text = self._grouping()
+                positions = indices_by_text.get((no, name))
+                if positions is None: return
+                df_item = self.all_data.iloc[positions]
                 
-                first = df_item.iloc[0]
-                design = float(first.get(AppConfig.Columns.DESIGN, 0))
-                upper = float(first.get(AppConfig.Columns.UPPER, 0))
-                lower = float(first.get(AppConfig.Columns.LOWER, 0))
+                # 設計值與公差載入時已轉為數值欄位，直接取該組第一列
+                first = positions[0]
+                design, upper, lower = (float(self.all_data[c].to_numpy()[first]) for c in
+                                        (AppConfig.Columns.DESIGN, AppConfig.Columns.UPPER, AppConfig.Columns.LOWER))
                 
-                plot_dlg = DistributionPlotDialog(f"{name} (No.{no})", df_item, design, upper, lower, self, self.current_theme)
-                plot_dlg.exec()
+                # 重複使用同一個對話框，只重繪圖表
+                if self.dist_dialog is None:
+                    self.dist_dialog = DistributionPlotDialog(self)
+                self.dist_dialog.set_item(f"{name} (No.{no})", df_item, design, upper, lower, self.current_theme)
+                self.dist_dialog.exec()
         except Exception as e:
             logging.error(f"繪圖失敗: {e}")
             QMessageBox.critical(self, "錯誤", f"無法分析: {e}")
@@ -967,17 +937,41 @@ class MeasurementAnalyzerApp(QMainWindow):
             if self.stats_data.empty: return
             path, _ = QFileDialog.getSaveFileName(self, "匯出統計報表", "Statistics.csv", "CSV (*.csv)")
             if path:
-                export_df = self.stats_data.drop(columns=["_design", "_upper", "_lower", "_sort_key", "CPK_RELIABILITY"], errors='ignore')
-                export_df.to_csv(path, index=False, encoding='utf-8-sig')
-                QMessageBox.information(self, "完成", "統計報表已匯出")
+                export_df = self.stats_data.drop(columns=["_design", "_upper", "_lower", "CPK_RELIABILITY"], errors='ignore')
+                self.start_export(export_df, path, "統計報表已匯出")
         elif curr_idx == 1: # Raw
             if self.all_data.empty: return
             path, _ = QFileDialog.getSaveFileName(self, "匯出原始資料", "RawData.csv", "CSV (*.csv)")
             if path:
-                self.all_data.to_csv(path, index=False, encoding='utf-8-sig')
-                QMessageBox.information(self, "完成", "原始資料已匯出")
+                self.start_export(self.all_data, path, "原始資料已匯出")
+
+    def start_export(self, df, path, done_msg):
+        """背景寫出 CSV，完成後僅於狀態列提示 (不彈出對話框)"""
+        self.btn_export.setEnabled(False)
+        self.lbl_info.setText(f"正在匯出: {path}")
+        self.export_thread = CsvExportThread(df, path)
+        self.export_thread.export_finished.connect(lambda p: self.on_export_finished(f"{done_msg}: {p}"))
+        self.export_thread.error_occurred.connect(self.on_export_failed)
+        self.export_thread.start()
+
+    def on_export_finished(self, msg):
+        self.btn_export.setEnabled(not self.all_data.empty)
+        self.lbl_info.setText(msg)
+
+        def clear_msg():
+            # 若期間已顯示其他訊息則保留
+            if self.lbl_info.text() == msg:
+                self.lbl_info.setText("")
+        QTimer.singleShot(5000, clear_msg)
+
+    def on_export_failed(self, error):
+        self.btn_export.setEnabled(not self.all_data.empty)
+        self.lbl_info.setText("匯出失敗。")
+        QMessageBox.warning(self, "錯誤", f"匯出失敗: {error}")
 
 if __name__ == "__main__":
+    # 打包後 (PyInstaller/Nuitka) 的子行程需要此呼叫，才能正確啟動檔案載入的 ProcessPool
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MeasurementAnalyzerApp()
     window.show()
@@ -4,6 +4,11 @@ Measurement Analyzer - 資料解析模組
 包含 CSV/PDF 解析邏輯與日期處理
 """
 import re
+import io
+import codecs
+import functools
+import itertools
+import numpy as np
 import pandas as pd
 import logging
 import traceback
@@ -14,31 +19,76 @@ from config import AppConfig
 # Optional PDF Support
 try:
     import pdfplumber
-    HAS_PDF_SUPPORT = True
+    HAS_PDFPLUMBER = True
 except ImportError:
-    HAS_PDF_SUPPORT = False
+    HAS_PDFPLUMBER = False
 
+# Optional PyMuPDF backend (C 實作，文字擷取速度遠快於 pdfplumber；可用時優先使用)
+try:
+    import pymupdf
+    HAS_PYMUPDF = True
+except ImportError as e:
+    HAS_PYMUPDF = False
+    # 未安裝時靜默改用 pdfplumber；已安裝卻匯入失敗 (例如與本地模組名稱衝突) 時記錄原因
+    if not (isinstance(e, ModuleNotFoundError) and e.name == 'pymupdf'):
+        logging.warning("PyMuPDF 匯入失敗，改用 pdfplumber: %s", e)
+
+HAS_PDF_SUPPORT = HAS_PDFPLUMBER or HAS_PYMUPDF
+
+# Optional encoding detection (候選編碼皆無法解碼時使用)
+try:
+    import charset_normalizer
+    HAS_CHARSET_NORMALIZER = True
+except ImportError:
+    HAS_CHARSET_NORMALIZER = False
+
+# Keyence PDF 資料列格式 (No 專案 實測值 單位 設計值 上限 下限 判斷)，模組載入時編譯一次
+_PDF_ROW_RE = re.compile(
+    r'^\s*(?P<no>\d+)\s+'           
+    r'(?P<proj>.+?)\s+'             
+    r'(?P<val>-?\d+(?:\.\d+)?)\s+'  
+    r'(?P<unit>mm|um)\s+'           
+    r'(?P<design>-?\d+(?:\.\d+)?)\s+'
+    r'(?P<up>-?\d+(?:\.\d+)?)\s+'
+    r'(?P<low>-?\d+(?:\.\d+)?)\s+'
+    r'(?P<judge>OK|NG|---|Warning)'
+)
+_NATURAL_SPLIT_RE = re.compile(r'(\d+)')
+_KEYENCE_DATE_RE = re.compile(r'(\d+)/(\d+)/(\d+)\s+(上午|下午)\s*(\d+):(\d+):(\d+)')
+_DATE_FALLBACK_FORMATS = ("%Y/%m/%d %H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d %p %I:%M:%S")
+_PDF_DATE_RE = re.compile(r'(\d{4}/\d{1,2}/\d{1,2}\s+(?:上午|下午)\s*\d{1,2}:\d{1,2}:\d{1,2})')
+
+# CSV 標題列偵測：讀取開頭位元組數、掃描列數與候選編碼
+_CSV_HEAD_BYTES = 32768
+_CSV_HEAD_LINES = 60
+_CSV_ENCODINGS = ('utf-8-sig', 'big5', 'cp950', 'shift_jis')
+_CSV_HEADER_KEYS = ("實測值", "設計值", "No")
+_CSV_UTF16_BOMS = (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
 
+
+@functools.lru_cache(maxsize=65536, typed=True)
 def natural_keys(text):
     """
     Fallback for natural sorting if natsort is missing.
+    (No / 測量專案 重複率高，結果以 lru_cache 快取)
     """
     try:
         text = str(text)
-        return tuple([int(c) if c.isdigit() else c.lower() for c in re.split(r'(\d+)', text)])
+        return tuple([int(c) if c.isdigit() else c.lower() for c in _NATURAL_SPLIT_RE.split(text)])
     except Exception:
         return (str(text),)
 
 
+@functools.lru_cache(maxsize=4096)
 def parse_keyence_date(date_str):
     """
-    解析 Keyence 報告中的日期格式
+    解析 Keyence 報告中的日期格式 (同批檔案日期重複率高，結果以 lru_cache 快取)
     """
     if not isinstance(date_str, str): return None
     date_str = date_str.strip()
     try:
         # 處理 Keyence 常見格式 "2023/01/01 下午 01:23:45"
-        match = re.search(r'(\d+)/(\d+)/(\d+)\s+(上午|下午)\s*(\d+):(\d+):(\d+)', date_str)
+        match = _KEYENCE_DATE_RE.search(date_str)
         if match:
             year, month, day, ampm, hour, minute, second = match.groups()
             year, month, day = int(year), int(month), int(day)
@@ -47,8 +97,7 @@ def parse_keyence_date(date_str):
             elif ampm == "上午" and hour == 12: hour = 0
             return datetime(year, month, day, hour, minute, second)
         else:
-            formats = ["%Y/%m/%d %H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d %p %I:%M:%S"]
-            for fmt in formats:
+            for fmt in _DATE_FALLBACK_FORMATS:
                 try:
                     return datetime.strptime(date_str, fmt)
                 except ValueError: continue
@@ -56,42 +105,100 @@ def parse_keyence_date(date_str):
     except Exception: return None
 
 
-def extract_text_by_clustering(page, y_tolerance=3):
+def cluster_words_to_lines(words, width, height, y_tolerance=3):
     """
-    使用座標聚類法提取 PDF 文字，解決表格錯位問題
+    座標聚類：將 top 相近的文字歸為同一列，並依 x0 排序組成文字行
+    words: [{'x0', 'top', 'text'}, ...]
     """
-    words = page.extract_words(keep_blank_chars=True)
-    if not words: return []
-    
     # Boundary check
-    width, height = page.width, page.height
     valid_words = [w for w in words if 0 <= w['x0'] <= width and 0 <= w['top'] <= height]
     
     if not valid_words:
         return []
 
-    rows = {} 
-    for word in valid_words:
-        top = word['top']
-        found_row = None
-        for y in rows:
-            if abs(top - y) <= y_tolerance:
-                found_row = y
-                break
-        
-        if found_row is not None:
-            rows[found_row].append(word)
-        else:
-            rows[top] = [word]
+    # 依 top 排序後單次掃描：與該列第一個 top 的距離超過容許值即換列 (以列首為基準，不沿相鄰間距串接)
+    # 取代逐字掃描既有列的雙層迴圈
+    n = len(valid_words)
+    tops = np.fromiter((w['top'] for w in valid_words), dtype=np.float64, count=n)
+    x0s = np.fromiter((w['x0'] for w in valid_words), dtype=np.float64, count=n)
+    order = np.argsort(tops, kind='stable')
+    sorted_ids = np.empty(n, dtype=np.int64)
+    row_id, row_start = 0, tops[order[0]]
+    for i, top in enumerate(tops[order].tolist()):
+        if top - row_start > y_tolerance:
+            row_id += 1
+            row_start = top
+        sorted_ids[i] = row_id
+    row_ids = np.empty(n, dtype=np.int64)
+    row_ids[order] = sorted_ids
     
-    sorted_ys = sorted(rows.keys())
-    lines = []
-    for y in sorted_ys:
-        row_words = sorted(rows[y], key=lambda w: w['x0'])
-        text_line = " ".join([w['text'] for w in row_words])
-        lines.append(text_line)
+    # 一次排序：列號 → x0；lexsort 為穩定排序，x0 相同時保留原始順序 (與逐列 sorted(x0) 結果相同)
+    word_order = np.lexsort((x0s, row_ids))
+    cuts = np.flatnonzero(np.diff(row_ids[word_order])) + 1
+    texts = [valid_words[i]['text'] for i in word_order]
+    bounds = zip(np.concatenate(([0], cuts)), np.concatenate((cuts, [n])))
+    return [" ".join(texts[start:end]) for start, end in bounds]
+
+
+def extract_text_by_clustering(page, y_tolerance=3):
+    """
+    使用座標聚類法提取 PDF 文字，解決表格錯位問題 (pdfplumber 頁面)
+    不保留空白字元：聚類後以單一空白串接，資料列樣式本身以 \s+ 分隔欄位
+    """
+    words = page.extract_words(keep_blank_chars=False)
+    if not words: return []
+    return cluster_words_to_lines(words, page.width, page.height, y_tolerance)
+
+
+def extract_text_by_clustering_pymupdf(page, y_tolerance=3):
+    """
+    使用座標聚類法提取 PDF 文字 (PyMuPDF 頁面)
+    get_text("words") 回傳 (x0, y0, x1, y1, text, block, line, word)，轉換後沿用相同聚類邏輯
+    """
+    words = [{'x0': w[0], 'top': w[1], 'text': w[4]} for w in page.get_text("words")]
+    if not words: return []
+    return cluster_words_to_lines(words, page.rect.width, page.rect.height, y_tolerance)
+
+
+def iter_pdf_page_lines(filepath):
+    """
+    逐頁產生 PDF 文字行 (PyMuPDF 優先，否則使用 pdfplumber)
+    """
+    if HAS_PYMUPDF:
+        with pymupdf.open(filepath) as doc:
+            for page in doc:
+                yield extract_text_by_clustering_pymupdf(page)
+    else:
+        with pdfplumber.open(filepath) as pdf:
+            for page in pdf.pages:
+                yield extract_text_by_clustering(page)
+
+
+def _parse_pdf_rows(lines):
+    """
+    從單頁文字行取出資料列
+    """
+    rows = []
+    for line in lines:
+        # 資料列必含單位，先以子字串檢查排除大部分非資料列
+        if "mm" not in line and "um" not in line: continue
+        if "測量專案" in line or "部件報告" in line or "測量結果" in line: continue
         
-    return lines
+        # 樣式以 ^ 開頭，match 與 search 結果相同但不必嘗試其他起點
+        match = _PDF_ROW_RE.match(line)
+        if match:
+            no, proj, val, unit, design, up, low, judge = match.groups()
+            rows.append({
+                AppConfig.Columns.NO: no,
+                AppConfig.Columns.PROJECT: proj.strip(),
+                AppConfig.Columns.MEASURED: val,
+                AppConfig.Columns.UNIT: unit,
+                AppConfig.Columns.DESIGN: design,
+                AppConfig.Columns.UPPER: up,
+                AppConfig.Columns.LOWER: low,
+                AppConfig.Columns.ORIGINAL_JUDGE: judge
+            })
+    return rows
 
 
 def read_pdf_file(filepath):
@@ -105,83 +212,86 @@ def read_pdf_file(filepath):
     data_list = []
     
     try:
-        with pdfplumber.open(filepath) as pdf:
-            first_page_words = extract_text_by_clustering(pdf.pages[0])
-            for line in first_page_words:
-                if "測量日期及時間" in line:
-                    date_match = re.search(r'(\d{4}/\d{1,2}/\d{1,2}\s+(?:上午|下午)\s*\d{1,2}:\d{1,2}:\d{1,2})', line)
-                    if date_match:
-                        measure_time = parse_keyence_date(date_match.group(1))
-                    break
-            
-            pattern = re.compile(
-                r'^\s*(?P<no>\d+)\s+'           
-                r'(?P<proj>.+?)\s+'             
-                r'(?P<val>-?\d+(?:\.\d+)?)\s+'  
-                r'(?P<unit>mm|um)\s+'           
-                r'(?P<design>-?\d+(?:\.\d+)?)\s+'
-                r'(?P<up>-?\d+(?:\.\d+)?)\s+'
-                r'(?P<low>-?\d+(?:\.\d+)?)\s+'
-                r'(?P<judge>OK|NG|---|Warning)'
-            )
-            
-            for page in pdf.pages:
-                lines = extract_text_by_clustering(page)
+        for page_no, lines in enumerate(iter_pdf_page_lines(filepath)):
+            if page_no == 0:
                 for line in lines:
-                    if "測量專案" in line or "部件報告" in line or "測量結果" in line: continue
-                    
-                    match = pattern.search(line)
-                    if match:
-                        d = match.groupdict()
-                        item = {
-                            AppConfig.Columns.NO: d['no'],
-                            AppConfig.Columns.PROJECT: d['proj'].strip(),
-                            AppConfig.Columns.MEASURED: d['val'],
-                            AppConfig.Columns.UNIT: d['unit'],
-                            AppConfig.Columns.DESIGN: d['design'],
-                            AppConfig.Columns.UPPER: d['up'],
-                            AppConfig.Columns.LOWER: d['low'],
-                            AppConfig.Columns.ORIGINAL_JUDGE: d['judge']
-                        }
-                        data_list.append(item)
-        
+                    if "測量日期及時間" in line:
+                        date_match = _PDF_DATE_RE.search(line)
+                        if date_match:
+                            measure_time = parse_keyence_date(date_match.group(1))
+                        break
+            
+            data_list.extend(_parse_pdf_rows(lines))
+    
         if data_list:
             df = pd.DataFrame(data_list)
             return df, measure_time
         else:
             return None, None
 
-    except pdfplumber.PDFSyntaxError as e:
-        logging.error(f"PDF 格式錯誤 {filepath}: {e}")
-        return None, None
     except PermissionError:
-        logging.error(f"無權限讀取 {filepath}")
+        logging.error("無權限讀取 %s", filepath)
         return None, None
     except Exception as e:
-        logging.error(f"PDF Error {filepath}: {e}\n{traceback.format_exc()}")
+        logging.error("PDF Error %s: %s\n%s", filepath, e, traceback.format_exc())
         return None, None
 
 
+def _scan_csv_head(text):
+    """
+    掃描 CSV 開頭文字，回傳 (header_idx, measure_time)；找不到標題列時 header_idx 為 None
+    """
+    # 先對整段文字做一次子字串檢查：編碼錯誤或非 Keyence 檔案時不含標題關鍵字，免去逐行掃描
+    if not all(k in text for k in _CSV_HEADER_KEYS):
+        return None, None
+    # 以 universal newline 切行，列號與 read_csv 的 skiprows 計算方式一致；只切出需要掃描的前幾列
+    lines = list(itertools.islice(io.StringIO(text, newline=None), _CSV_HEAD_LINES))
+    measure_time = None
+    for line in lines[:20]:
+        if "測量日期及時間" in line:
+            parts = line.split(',')
+            if len(parts) > 1:
+                measure_time = parse_keyence_date(parts[1].strip())
+            break
+    for i, line in enumerate(lines): 
+        if all(k in line for k in _CSV_HEADER_KEYS):
+            return i, measure_time
+    return None, measure_time
+
+
 def find_header_row_and_date_csv(filepath):
     """
     尋找 CSV 檔頭與日期 (自動偵測編碼)
+    僅讀取檔案開頭一次，於記憶體中依序嘗試候選編碼解碼
     """
     try:
-        encodings = ['utf-8-sig', 'big5', 'cp950', 'shift_jis']
-        for enc in encodings:
+        with open(filepath, 'rb') as f:
+            head = f.read(_CSV_HEAD_BYTES)
+        if head.startswith(_CSV_UTF16_BOMS):
+            # UTF-16 檔案由 BOM 直接決定編碼 (候選編碼皆無法正確解碼)；截成偶數長度避免最後一個字元被切半
+            header_idx, measure_time = _scan_csv_head(head[:len(head) & ~1].decode('utf-16', errors='ignore'))
+            if header_idx is not None:
+                return header_idx, 'utf-16', measure_time
+            return None, None, None
+        if len(head) == _CSV_HEAD_BYTES:
+            # 截斷在最後一個換行，避免多位元組字元被切半造成解碼失敗
+            cut = head.rfind(b'\n')
+            if cut > 0: head = head[:cut + 1]
+        
+        for enc in _CSV_ENCODINGS:
             try:
-                with open(filepath, 'r', encoding=enc) as f:
-                    lines = [next(f) for _ in range(60)]
-                measure_time = None
-                for line in lines[:20]:
-                    if "測量日期及時間" in line:
-                        parts = line.split(',')
-                        if len(parts) > 1:
-                            measure_time = parse_keyence_date(parts[1].strip())
-                        break
-                for i, line in enumerate(lines): 
-                    if "No" in line and "實測值" in line and "設計值" in line:
-                        return i, enc, measure_time
-            except Exception: continue 
+                text = head.decode(enc)
+            except UnicodeDecodeError: continue
+            header_idx, measure_time = _scan_csv_head(text)
+            if header_idx is not None:
+                return header_idx, enc, measure_time
+        
+        # 候選編碼皆失敗時，改用 charset_normalizer 猜測編碼
+        if HAS_CHARSET_NORMALIZER:
+            best = charset_normalizer.from_bytes(head).best()
+            if best is not None and best.encoding not in _CSV_ENCODINGS:
+                header_idx, measure_time = _scan_csv_head(str(best))
+                if header_idx is not None:
+                    return header_idx, best.encoding, measure_time
         return None, None, None
     except Exception: return None, None, None
@@ -42,6 +42,44 @@ def calculate_cpk(values, usl, lsl, min_samples=30):
     return cpk, reliability
 
 
+def calculate_cpk_vectorized(count, mean, std, usl, lsl, min_samples=30):
+    """
+    一次計算多組 CPK (各參數為等長 ndarray，對應 groupby 聚合結果)
+    判定規則與 calculate_cpk 相同
+    Returns:
+        (cpk, reliability): CPK 陣列與可靠性標記陣列
+    """
+    count = np.asarray(count)
+    mean = np.asarray(mean, dtype=float)
+    std = np.asarray(std, dtype=float)
+    usl = np.asarray(usl, dtype=float)
+    lsl = np.asarray(lsl, dtype=float)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cpu = (usl - mean) / (3 * std)
+        cpl = (mean - lsl) / (3 * std)
+    cpk = np.where(cpl < cpu, cpl, cpu)  # 與內建 min(cpu, cpl) 的 NaN 行為一致
+    reliability = np.where(count < min_samples, 'small_sample', 'reliable').astype(object)
+    
+    invalid = (count < 2) | (np.abs(usl - lsl) < 1e-9)
+    zero_std = ~invalid & (std < 1e-9)
+    cpk[zero_std] = 999.0  # 標記為不可靠 (std=0)
+    cpk[invalid] = np.nan
+    reliability[invalid | zero_std] = 'invalid'
+    return cpk, reliability
+
+
+def _yield_z_score(target_yield):
+    """計算目標良率對應的雙邊 Z 值"""
+    tail_prob = (1 - target_yield) / 2
+    
+    if HAS_SCIPY:
+        return scipy_stats.norm.ppf(1 - tail_prob)
+    # Fallback: 使用常見 Z 值近似
+    z_table = {0.90: 1.645, 0.95: 1.96, 0.99: 2.576, 0.9973: 3.0}
+    return z_table.get(target_yield, 1.645)
+
+
 def calculate_tolerance_for_yield(values, design_val, target_yield=0.90):
     """
     根據目標良率反推所需公差
@@ -84,15 +122,7 @@ def calculate_tolerance_for_yield(values, design_val, target_yield=0.90):
         result['std'] = 0
         return result
     
-    # 計算 Z 值（雙邊）
-    tail_prob = (1 - target_yield) / 2
-    
-    if HAS_SCIPY:
-        z_score = scipy_stats.norm.ppf(1 - tail_prob)
-    else:
-        # Fallback: 使用常見 Z 值近似
-        z_table = {0.90: 1.645, 0.95: 1.96, 0.99: 2.576, 0.9973: 3.0}
-        z_score = z_table.get(target_yield, 1.645)
+    z_score = _yield_z_score(target_yield)
     
     # 計算偏移量（平均值與設計值的差距）
     offset = mean_val - design_val
@@ -115,3 +145,38 @@ def calculate_tolerance_for_yield(values, design_val, target_yield=0.90):
     result['reliability'] = 'reliable' if len(values) >= 30 else 'small_sample'
     
     return result
+
+
+def calculate_tolerance_for_yield_vectorized(count, mean, std, design_val, target_yield=0.90):
+    """
+    一次反推多組建議公差 (各參數為等長 ndarray，對應 groupby 聚合結果)
+    判定規則與 calculate_tolerance_for_yield 相同
+    Returns:
+        dict: symmetric_tol / upper_tol / lower_tol / offset 陣列與 reliability 標記陣列
+    """
+    count = np.asarray(count)
+    mean = np.asarray(mean, dtype=float)
+    std = np.asarray(std, dtype=float)
+    design_val = np.asarray(design_val, dtype=float)
+    
+    z_score = _yield_z_score(target_yield)
+    offset = mean - design_val
+    symmetric_tol = z_score * std + np.abs(offset)
+    upper_tol = z_score * std + offset
+    lower_tol = -(z_score * std - offset)
+    reliability = np.where(count >= 30, 'reliable', 'small_sample').astype(object)
+    
+    invalid = count < 2
+    zero_std = ~invalid & (std < 1e-9)
+    unusable = invalid | zero_std
+    for arr in (symmetric_tol, upper_tol, lower_tol, offset):
+        arr[unusable] = np.nan
+    reliability[invalid] = 'invalid'
+    reliability[zero_std] = 'zero_std'
+    return {
+        'symmetric_tol': symmetric_tol,
+        'upper_tol': upper_tol,
+        'lower_tol': lower_tol,
+        'reliability': reliability,
+        'offset': offset
+    }
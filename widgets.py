@@ -4,14 +4,17 @@ Measurement Analyzer - GUI 元件模組
 包含自定義表格元件、對話框與圖表繪製
 """
 import logging
+import math
+from operator import itemgetter
 import pandas as pd
 import numpy as np
+from datetime import datetime
 
 # PyQt6 imports
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
-                             QDialog, QTabWidget, QTextEdit, QTableWidgetItem, QGroupBox, QComboBox, QDoubleSpinBox)
+                             QDialog, QTabWidget, QTextEdit, QGroupBox, QComboBox, QDoubleSpinBox)
 from PyQt6.QtGui import QColor, QBrush, QFont
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
 
 # Matplotlib imports
 import matplotlib
@@ -19,12 +22,13 @@ import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
 from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
 
 # Internal imports
-from config import AppConfig, UPDATE_LOG
+from config import AppConfig, DISPLAY_COLUMNS, UPDATE_LOG
 from parsers import natural_keys
-from statistics import calculate_tolerance_for_yield
+from stats_utils import calculate_tolerance_for_yield
 from xy_analyzer import calculate_2d_suggested_tolerance
 
 # Natsort
@@ -34,49 +38,615 @@ try:
 except ImportError:
     HAS_NATSORT = False
 
+# 自然排序 key 函式只建立一次，排序比較時直接呼叫
+_NATSORT_KEY = natsort_keygen(alg=ns.IGNORECASE) if HAS_NATSORT else None
+
+
+# 趨勢圖最多繪製的點數，超過時以 LTTB 降採樣
+_TREND_MAX_POINTS = 2000
+
+# XY / 陣列對話框資料 (list of dicts) 的欄位取值函式，搭配 map 在 C 層逐筆取值
+_get_dx = itemgetter('dx')
+_get_dy = itemgetter('dy')
+_get_index = itemgetter('index')
+_get_value = itemgetter('value')
+
+# 陣列條形圖/熱力圖色表 (模組載入時取得一次；plt.cm.get_cmap 已於 Matplotlib 3.9 移除)
+_CMAP_ARRAY = matplotlib.colormaps['coolwarm']
+
+# 散佈圖點數超過此值時將散點點陣化 (工具列另存 PDF/SVG 時不會輸出逐點向量路徑)
+_SCATTER_RASTER_MIN_POINTS = 2000
+
+# 常見中文字型清單 (優先順序)
+_CHINESE_FONT_NAMES = ['Microsoft JhengHei', 'Microsoft YaHei', 'SimHei', 'PingFang TC', 'Arial Unicode MS']
+
+# 系統可用字型只在模組載入時掃描一次 (fontManager.ttflist 常有數百筆)
+try:
+    _SYSTEM_FONTS = {f.name for f in fm.fontManager.ttflist}
+except Exception as e:
+    logging.error(f"字型清單讀取失敗: {e}")
+    _SYSTEM_FONTS = set()
+_CHINESE_FONT = next((name for name in _CHINESE_FONT_NAMES if name in _SYSTEM_FONTS), None)
+
+# 目前 rcParams 已套用的主題 (apply_plot_style 同主題時不重設)
+_applied_theme = None
+
+
+# 公差建議報告樣板 (update_tolerance_display 依可靠性擇一格式化)
+_TOL_HEADER_TMPL = (
+    "═══════════════════════════════════════\n"
+    "  測量專案：{item_name}\n"
+    "  目標良率：{yield_pct:.2f}%\n"
+    "═══════════════════════════════════════\n"
+    "\n"
+)
+_TOL_INVALID_TMPL = _TOL_HEADER_TMPL + "❌ 無法計算：數據不足 (需至少 2 個樣本)"
+_TOL_ZERO_STD_TMPL = _TOL_HEADER_TMPL + "❌ 無法計算：標準差為零 (所有數據相同)"
+_TOL_OK_TMPL = _TOL_HEADER_TMPL + (
+    "📊 【數據統計】\n"
+    "   樣本數：{count}\n"
+    "   平均值 (μ)：{mean:.4f}\n"
+    "   標準差 (σ)：{std:.4f}\n"
+    "   設計值：{design_val:.4f}\n"
+    "   製程偏移：{offset:+.4f}\n"
+    "\n"
+    "📐 【建議公差】\n"
+    "   ✅ 對稱公差：±{symmetric_tol:.4f}\n"
+    "\n"
+    "   📈 非對稱建議：\n"
+    "      上限公差：+{upper_tol:.4f}\n"
+    "      下限公差：{lower_tol:.4f}\n"
+    "\n"
+    "📋 【與當前規格比較】\n"
+    "   當前上限：+{current_upper:.4f}\n"
+    "   當前下限：{current_lower:.4f}"
+    "{advice}{note}"
+)
+_TOL_ADVICE_WIDEN = ("\n\n   ⚠️ 警告：要達到 {yield_pct:.0f}% 良率，"
+                     "\n      建議公差比當前規格大 {over_pct:.1f}%"
+                     "\n      建議放寬規格或改善製程")
+_TOL_ADVICE_LOOSE = "\n\n   ✅ 良好：當前規格充裕，\n      實際只需 {ratio_pct:.1f}% 即可達標"
+_TOL_ADVICE_OK = "\n\n   ℹ️ 規格適中 (比例：{ratio_pct:.1f}%)"
+_TOL_SMALL_SAMPLE_NOTE = "\n\n⚠️ 注意：樣本數少於 30，結果僅供參考\n   建議累積更多數據後再做決策"
+
 
 def set_chinese_font():
     """設定 Matplotlib 中文字型 (回歸 v1.7.1 策略)"""
-    # 常見中文字型清單 (優先順序)
-    font_names = ['Microsoft JhengHei', 'Microsoft YaHei', 'SimHei', 'PingFang TC', 'Arial Unicode MS']
-    
-    # 取得系統可用字型
     try:
-        system_fonts = set([f.name for f in fm.fontManager.ttflist])
-        
-        # 尋找第一個可用的中文字型
-        found = False
-        for name in font_names:
-            if name in system_fonts:
-                matplotlib.rcParams['font.sans-serif'] = [name] + matplotlib.rcParams['font.sans-serif']
-                found = True
-                break
+        if _CHINESE_FONT:
+            # 已在首位時不重複加入，避免 font.sans-serif 清單每次呼叫都變長
+            sans_serif = matplotlib.rcParams['font.sans-serif']
+            if not sans_serif or sans_serif[0] != _CHINESE_FONT:
+                matplotlib.rcParams['font.sans-serif'] = [_CHINESE_FONT] + sans_serif
+        else:
+            logging.warning("未偵測到常見中文字型，圖表可能顯示方格。")
         
         # 設定負號正確顯示
         matplotlib.rcParams['axes.unicode_minus'] = False
-        
-        if not found:
-            logging.warning("未偵測到常見中文字型，圖表可能顯示方格。")
             
     except Exception as e:
         logging.error(f"字型設定失敗: {e}")
 
 
-class NumericTableWidgetItem(QTableWidgetItem):
-    """支援數值排序與自然排序的表格項目"""
-    def __lt__(self, other):
-        if HAS_NATSORT:
-            try:
-                natsort_key = natsort_keygen(alg=ns.IGNORECASE)
-                return natsort_key(self.text()) < natsort_key(other.text())
-            except Exception:
-                pass
-        
+def apply_plot_style(theme):
+    """
+    套用主題樣式與圖表共用設定
+    plt.style.use 會將 rcParams 重設為樣式預設值，中文字型與繪圖效能設定須在其後重新套用
+    rcParams 只在此處修改，主題與上次相同時設定仍有效，直接略過
+    """
+    global _applied_theme
+    if theme == _applied_theme:
+        return
+    if theme == 'dark':
+        plt.style.use('dark_background')
+    else:
+        plt.style.use('default')
+    # [v2.0.2 關鍵修正] 設定 Style 後必須重新套用中文字型，否則會被覆蓋回預設值
+    set_chinese_font()
+    # 長路徑交由 Agg 分段繪製並簡化重疊頂點 (門檻維持預設，避免量測尖峰被削平)
+    matplotlib.rcParams['path.simplify'] = True
+    matplotlib.rcParams['agg.path.chunksize'] = 10000
+    matplotlib.rcParams['text.usetex'] = False
+    _applied_theme = theme
+
+
+def natural_less_than(left_text, right_text):
+    """自然排序比較 (natsort 優先，否則使用 natural_keys)"""
+    if HAS_NATSORT:
+        try:
+            return _NATSORT_KEY(left_text) < _NATSORT_KEY(right_text)
+        except Exception:
+            pass
+    # Fallback
+    return natural_keys(left_text) < natural_keys(right_text)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets 降採樣，回傳保留點的索引
+    保留首尾點，其餘每個區段各取與前一保留點、下一區段平均點構成最大三角形的點，維持曲線形狀
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    edges = np.append(edges, n)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end, next_end = edges[i], edges[i + 1], edges[i + 2]
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        idx[i + 1] = a
+    return idx
+
+
+def line_contains_sorted(line, event):
+    """
+    x 遞增的折線命中測試，回傳值與 Line2D.contains 相同 (cont, {"ind": [...]})
+    以 searchsorted 只檢查滑鼠左右 pickradius 範圍內的頂點，不逐點掃描整條線
+    """
+    x, y = line.get_data()
+    x = np.asarray(x, dtype=np.float64)
+    if event.x is None or len(x) == 0:
+        return False, {"ind": []}
+    trans = line.axes.transData
+    radius = line.figure.dpi / 72.0 * line.get_pickradius()
+    x_lo = trans.inverted().transform((event.x - radius, event.y))[0]
+    x_hi = trans.inverted().transform((event.x + radius, event.y))[0]
+    start, end = np.searchsorted(x, [min(x_lo, x_hi), max(x_lo, x_hi)], side='left')
+    end = min(end + 1, len(x))
+    if start >= end:
+        return False, {"ind": []}
+    pts = trans.transform(np.column_stack([x[start:end], np.asarray(y[start:end], dtype=np.float64)]))
+    dist = np.hypot(pts[:, 0] - event.x, pts[:, 1] - event.y)
+    dist[np.isnan(dist)] = np.inf
+    best = int(np.argmin(dist))
+    if dist[best] > radius:
+        return False, {"ind": []}
+    return True, {"ind": [start + best]}
+
+
+def numeric_sort_key(texts):
+    """顯示字串一次轉為 float 陣列與可轉換遮罩，排序比較時不必逐次 float() 解析"""
+    texts = pd.Series(texts, dtype=object)
+    values = pd.to_numeric(texts, errors='coerce').to_numpy(dtype=float)
+    parsed = ~np.isnan(values) | (texts.astype(str).str.lower() == "nan").to_numpy()
+    return values, parsed
+
+
+def natural_ranks(texts):
+    """字串陣列依自然排序的名次 (相同字串名次相同)；只對不重複的字串計算排序鍵"""
+    uniq, inverse = np.unique(np.asarray(texts, dtype=str), return_inverse=True)
+    order = None
+    if HAS_NATSORT:
+        try:
+            order = sorted(range(len(uniq)), key=lambda i: _NATSORT_KEY(uniq[i]))
+        except Exception:
+            pass
+    if order is None:
+        # Fallback
+        order = sorted(range(len(uniq)), key=lambda i: natural_keys(uniq[i]))
+    ranks = np.empty(len(uniq), dtype=np.int64)
+    ranks[order] = np.arange(len(uniq))
+    return ranks[inverse.ravel()]
+
+
+class RawDataTableModel(QAbstractTableModel):
+    """
+    原始數據表格模型
+    直接持有 DataFrame，僅在 View 繪製可視範圍時才格式化儲存格，
+    篩選時以列索引陣列 (rows) 指向原始資料，不複製 DataFrame。
+    列數以 canFetchMore/fetchMore 分批開放給 View，捲動到底部時才再載入下一批。
+    """
+    NUMERIC_COLUMNS = {AppConfig.Columns.NO, AppConfig.Columns.MEASURED, AppConfig.Columns.DESIGN,
+                       AppConfig.Columns.DIFF, AppConfig.Columns.UPPER, AppConfig.Columns.LOWER}
+    # 顏色為不可變值，於類別層級建立一次供所有實例共用
+    RED_BRUSH = QBrush(QColor(255, 220, 220))
+    RED_TEXT = QColor(200, 0, 0)
+    GREEN_TEXT = QColor(0, 128, 0)
+    FETCH_BATCH = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = np.arange(0)
+        self._loaded = 0
+        self._texts = [np.array([], dtype=object) for _ in DISPLAY_COLUMNS]
+        self._is_fail = np.zeros(0, dtype=bool)
+        self._is_ok = np.zeros(0, dtype=bool)
+        # 數值欄位的欄位位置 (比較時直接查集合，不再逐次查欄名)
+        self.numeric_columns = frozenset(i for i, c in enumerate(DISPLAY_COLUMNS) if c in self.NUMERIC_COLUMNS)
+        self._sort_keys = {}
+        self._sort_column = -1          # 目前排序欄 (-1 表示維持載入順序)
+        self._sort_order = Qt.SortOrder.AscendingOrder
+        self._diff_col = DISPLAY_COLUMNS.index(AppConfig.Columns.DIFF)
+        self._result_col = DISPLAY_COLUMNS.index(AppConfig.Columns.RESULT)
+
+    def set_dataframe(self, df, rows=None):
+        """替換資料來源；rows 為要顯示的列位置陣列 (None 表示全部)"""
+        self.beginResetModel()
+        self._rows = np.arange(len(df)) if rows is None else rows
+        self._loaded = min(self.FETCH_BATCH, len(self._rows))
+        # 每欄一次取出 ndarray 並向量化轉為顯示字串，data() 只需做陣列索引
+        self._texts = [self._format_column(df, c, self._rows) for c in DISPLAY_COLUMNS]
+        result = self._texts[self._result_col]
+        self._is_fail = result == "FAIL"
+        self._is_ok = result == "OK"
+        self._sort_keys = {c: numeric_sort_key(self._texts[c]) for c in self.numeric_columns}
+        # 重新載入時沿用目前的排序欄，排序在模型內一次完成，與已開放的列數無關
+        if self._sort_column >= 0 and len(self._rows):
+            self._permute(self._sort_permutation(self._sort_column, self._sort_order))
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """
+        於模型內排序：以 numpy 對整欄排序鍵計算排列後重排各欄陣列，再送出 layoutChanged
+        (不經由 QSortFilterProxyModel 逐次呼叫 Python lessThan)
+        """
+        self._sort_column, self._sort_order = column, order
+        if not len(self._rows):
+            return
+        self.layoutAboutToBeChanged.emit()
+        perm = self._sort_permutation(column, order)
+        self._permute(perm)
+        # 選取等持續索引改指向排序後的新位置
+        new_pos = np.empty(len(perm), dtype=np.int64)
+        new_pos[perm] = np.arange(len(perm))
+        old_indexes = self.persistentIndexList()
+        new_indexes = []
+        for index in old_indexes:
+            row = int(new_pos[index.row()])
+            # 新位置超出已開放列數時無法對應，改為無效索引
+            new_indexes.append(self.index(row, index.column()) if row < self._loaded else QModelIndex())
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    def _sort_permutation(self, column, order):
+        """
+        回傳排序後的列排列；穩定排序，相同值維持目前順序 (與 QSortFilterProxyModel 相同)
+        數值欄位：可轉為數值者依 float 排在前，其餘依自然排序；其他欄位依字串排序
+        """
+        if column < 0:
+            # 恢復載入順序 (rows 原本即為遞增的列位置)
+            return np.argsort(self._rows, kind='stable')
+        if column in self.numeric_columns:
+            values, parsed = self._sort_keys[column]
+            natural = np.zeros(len(values), dtype=np.int64)
+            unparsed = np.flatnonzero(~parsed)
+            if len(unparsed):
+                natural[unparsed] = natural_ranks(self._texts[column][unparsed])
+            # 先求遞增排列，再將相同的 (可轉換, 數值, 自然名次) 合併為同一名次
+            asc = np.lexsort((natural, values, ~parsed))
+            p, v, nr = parsed[asc], values[asc], natural[asc]
+            same = (p[1:] == p[:-1]) & (nr[1:] == nr[:-1]) & ((v[1:] == v[:-1]) | (np.isnan(v[1:]) & np.isnan(v[:-1])))
+            ranks = np.empty(len(asc), dtype=np.int64)
+            ranks[asc] = np.concatenate(([0], np.cumsum(~same)))
+        else:
+            _, ranks = np.unique(np.asarray(self._texts[column], dtype=str), return_inverse=True)
+            ranks = ranks.ravel()
+        if order == Qt.SortOrder.DescendingOrder:
+            ranks = -ranks
+        return np.argsort(ranks, kind='stable')
+
+    def _permute(self, perm):
+        """依排列重排列索引與所有逐列陣列"""
+        self._rows = self._rows[perm]
+        self._texts = [texts[perm] for texts in self._texts]
+        self._is_fail = self._is_fail[perm]
+        self._is_ok = self._is_ok[perm]
+        self._sort_keys = {c: (values[perm], parsed[perm]) for c, (values, parsed) in self._sort_keys.items()}
+
+    @staticmethod
+    def _format_value(column_name, val):
+        if column_name == AppConfig.Columns.TIME and isinstance(val, (datetime, pd.Timestamp)):
+            return val.strftime("%Y/%m/%d %H:%M:%S") if pd.notnull(val) else ""
+        return f"{val:.4f}" if isinstance(val, (float, np.floating)) else str(val)
+
+    @classmethod
+    def _format_column(cls, df, column_name, rows):
+        """將整欄 (rows 指定的列) 轉為顯示字串陣列"""
+        if column_name not in df.columns:
+            return np.full(len(rows), "", dtype=object)
+        col = df[column_name]
+        if column_name == AppConfig.Columns.TIME and pd.api.types.is_datetime64_any_dtype(col.dtype):
+            return col.iloc[rows].dt.strftime("%Y/%m/%d %H:%M:%S").fillna("").to_numpy(dtype=object)
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            # 只格式化類別本身，再以 codes 展開
+            categories = np.array([cls._format_value(column_name, v) for v in col.cat.categories] + ["nan"], dtype=object)
+            return categories[col.cat.codes.to_numpy()[rows]]
+        values = col.to_numpy()[rows]
+        if values.dtype.kind == 'f':
+            return np.char.mod('%.4f', values).astype(object)
+        if values.dtype.kind in 'iub':
+            return values.astype(str).astype(object)
+        return np.array([cls._format_value(column_name, v) for v in values], dtype=object)
+
+    def is_numeric_column(self, column):
+        return column in self.numeric_columns
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < len(self._rows)
+
+    def fetchMore(self, parent=QModelIndex()):
+        self._fetch_to(min(self._loaded + self.FETCH_BATCH, len(self._rows)))
+
+    def _fetch_to(self, end):
+        if end <= self._loaded:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, end - 1)
+        self._loaded = end
+        self.endInsertRows()
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(DISPLAY_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return DISPLAY_COLUMNS[section]
+        return str(section + 1)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._texts[column][row]
+
+        if role in (Qt.ItemDataRole.ForegroundRole, Qt.ItemDataRole.BackgroundRole):
+            if self._is_fail[row]:
+                if column in (self._diff_col, self._result_col):
+                    return self.RED_TEXT if role == Qt.ItemDataRole.ForegroundRole else self.RED_BRUSH
+            elif self._is_ok[row] and column == self._result_col and role == Qt.ItemDataRole.ForegroundRole:
+                return self.GREEN_TEXT
+        return None
+
+
+class StatsTableModel(QAbstractTableModel):
+    """
+    統計摘要表格模型
+    直接持有 stats_data，顯示文字與顏色於 set_dataframe 時整欄計算一次，
+    Tooltip 僅在滑鼠停留時才依該列數值組成。
+    """
+    HEADERS = ["No", "測量專案", "類型", "樣本數", "NG數", "不良率(%)", "CPK", "上限公差", "下限公差",
+               "建議公差(90%)", "平均值", "最大值", "最小值"]
+    COL_NO, COL_NAME, COL_TYPE, COL_CPK, COL_TOL = 0, 1, 2, 6, 9
+    # 以自然排序比較的欄位 (測量專案與類型以一般字串排序)
+    numeric_columns = frozenset(range(len(HEADERS))) - {COL_NAME, COL_TYPE}
+    RED, ORANGE, BLUE, PURPLE = QColor('red'), QColor('darkorange'), QColor('blue'), QColor('purple')
+    BRUSH_GOOD = QBrush(QColor(200, 255, 200))
+    BRUSH_WARN = QBrush(QColor(255, 255, 200))
+    BRUSH_BAD = QBrush(QColor(255, 200, 200))
+    BRUSH_TOL_LOOSE = QBrush(QColor(220, 255, 220))
+    BRUSH_TOL_TIGHT = QBrush(QColor(255, 220, 220))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._df = pd.DataFrame()
+        self._texts = [np.array([], dtype=object) for _ in self.HEADERS]
+        self._foreground = {}
+        self._background = {}
+        self._sort_keys = {}
+
+    def set_dataframe(self, df):
+        """替換資料來源並重新計算顯示內容"""
+        self.beginResetModel()
+        self._df = df.reset_index(drop=True)
+        self._build_cells()
+        self.endResetModel()
+
+    def _column(self, name, default):
+        if name in self._df.columns:
+            return self._df[name].to_numpy()
+        return np.full(len(self._df), default, dtype=object)
+
+    @staticmethod
+    def _fmt(fmt, values):
+        return np.array([fmt.format(v) for v in values], dtype=object)
+
+    def _build_cells(self):
+        n = len(self._df)
+        types = self._column('類型', '1D').astype(str)
+        counts = self._column('樣本數', 0)
+        ng = self._column('NG數', 0)
+        rates = self._column('不良率(%)', 0).astype(float)
+        cpk = self._column('CPK', np.nan).astype(float)
+        cpk_rel = self._column('CPK_RELIABILITY', 'reliable')
+        tol = self._column('建議公差', np.nan).astype(float)
+        tol_rel = self._column('TOL_RELIABILITY', 'invalid')
+        uppers = self._column('_upper', 0).astype(float)
+        lowers = self._column('_lower', 0).astype(float)
+
+        cpk_invalid = cpk_rel == 'invalid'
+        cpk_small = cpk_rel == 'small_sample'
+        cpk_text = self._fmt("{:.3f}", cpk)
+        cpk_text[cpk_small] = cpk_text[cpk_small] + " ⚠"
+        cpk_text[cpk_invalid] = "---"
+        tol_invalid = (tol_rel == 'invalid') | (tol_rel == 'zero_std')
+        tol_small = tol_rel == 'small_sample'
+        tol_text = self._fmt("±{:.4f}", tol)
+        tol_text[tol_small] = tol_text[tol_small] + " ⚠"
+        tol_text[tol_invalid] = "---"
+
+        self._texts = [
+            self._column('No', '').astype(str).astype(object),
+            self._column('測量專案', '').astype(str).astype(object),
+            types.astype(object),
+            counts.astype(str).astype(object),
+            ng.astype(str).astype(object),
+            self._fmt("{:.2f}", rates),
+            cpk_text,
+            self._fmt("{:.4f}", uppers),
+            self._fmt("{:.4f}", lowers),
+            tol_text,
+            self._fmt("{:.4f}", self._column('平均值', np.nan)),
+            self._fmt("{:.4f}", self._column('最大值', np.nan)),
+            self._fmt("{:.4f}", self._column('最小值', np.nan)),
+        ]
+
+        def colors(pairs):
+            out = np.full(n, None, dtype=object)
+            for mask, color in pairs:
+                out[mask] = color
+            return out
+
+        self._foreground = {
+            self.COL_TYPE: colors([(types == '2D', self.BLUE), (types == '陣列', self.PURPLE)]),
+            4: colors([(ng.astype(float) > 0, self.RED)]),
+            5: colors([(rates > 0, self.RED)]),
+            self.COL_CPK: colors([(cpk_small, self.ORANGE)]),
+            self.COL_TOL: colors([(~tol_invalid & tol_small, self.ORANGE)]),
+        }
+        cpk_reliable = ~(cpk_invalid | cpk_small)
+        current_tol = np.maximum(np.abs(uppers), np.abs(lowers))
+        tol_checked = ~tol_invalid & ~np.isnan(tol) & (current_tol > 0)
+        self._background = {
+            self.COL_CPK: colors([(cpk_reliable, self.BRUSH_GOOD),
+                                  (cpk_reliable & (cpk < 1.33), self.BRUSH_WARN),
+                                  (cpk_reliable & (cpk < 1.0), self.BRUSH_BAD)]),
+            self.COL_TOL: colors([(tol_checked & (tol < current_tol * 0.8), self.BRUSH_TOL_LOOSE),  # 規格充裕
+                                  (tol_checked & (tol > current_tol * 1.2), self.BRUSH_TOL_TIGHT)]),  # 規格偏緊
+        }
+        self._sort_keys = {c: numeric_sort_key(self._texts[c]) for c in self.numeric_columns}
+
+    def _tooltip(self, row, column):
+        rec = self._df.iloc[row]
+        if column == self.COL_CPK:
+            reliability = rec.get('CPK_RELIABILITY', 'reliable')
+            if reliability == 'invalid':
+                return "無法計算 CPK (數據不足或規格異常)"
+            if reliability == 'small_sample':
+                return ("警告：樣本數少於 30，CPK 值僅供參考\n"
+                        f"當前樣本數：{rec['樣本數']}\n"
+                        "建議：累積更多數據後再評估製程能力")
+            return f"CPK: {rec['CPK']:.3f} (樣本數：{rec['樣本數']})"
+        if column == self.COL_TOL:
+            if rec.get('TOL_RELIABILITY', 'invalid') in ('invalid', 'zero_std'):
+                return "無法計算 (數據不足或標準差為零)"
+            tol_offset = rec.get('TOL_OFFSET', np.nan)
+            tooltip_lines = [
+                f"【達成 {AppConfig.DEFAULT_TARGET_YIELD*100:.0f}% 良率所需公差】",
+                f"對稱公差：±{rec['建議公差']:.4f}",
+                f"",
+                f"📊 非對稱建議：",
+                f"  上限：+{rec.get('TOL_UPPER', np.nan):.4f}",
+                f"  下限：{rec.get('TOL_LOWER', np.nan):.4f}",
+                f"",
+                f"📐 當前設定：",
+                f"  上限：+{rec.get('_upper', 0):.4f}",
+                f"  下限：{rec.get('_lower', 0):.4f}",
+                f"",
+                f"📈 製程偏移：{tol_offset:+.4f}" if not np.isnan(tol_offset) else ""
+            ]
+            return "\n".join([l for l in tooltip_lines if l])
+        return None
+
+    def sort_key(self, column):
+        """回傳數值欄位的 (float 陣列, 可轉換遮罩)"""
+        return self._sort_keys[column]
+
+    def item_key(self, row):
+        """回傳 (No, 測量專案) 顯示文字，供開啟詳細圖表使用"""
+        return self._texts[self.COL_NO][row], self._texts[self.COL_NAME][row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._df)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return str(section + 1)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._texts[column][row]
+        if role == Qt.ItemDataRole.ForegroundRole:
+            colors = self._foreground.get(column)
+            return colors[row] if colors is not None else None
+        if role == Qt.ItemDataRole.BackgroundRole:
+            colors = self._background.get(column)
+            return colors[row] if colors is not None else None
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self._tooltip(row, column)
+        return None
+
+
+class NaturalSortProxyModel(QSortFilterProxyModel):
+    """排序代理模型：數值欄位以 float 比較，無法轉換時改用自然排序 (取代 NumericTableWidgetItem)"""
+    def lessThan(self, left, right):
+        source = self.sourceModel()
+        column = left.column()
+        if column not in source.numeric_columns:
+            return super().lessThan(left, right)
+        values, parsed = source.sort_key(column)
+        left_row, right_row = left.row(), right.row()
+        if parsed[left_row] and parsed[right_row]:
+            return bool(values[left_row] < values[right_row])
         try:
-            # Fallback
-            return natural_keys(self.text()) < natural_keys(other.text())
+            return natural_less_than(source.data(left), source.data(right))
         except Exception:
-            return super().__lt__(other)
+            return super().lessThan(left, right)
+
+
+def connect_lazy_tabs(tabs, builders):
+    """
+    分頁延遲建立：builders 為 {分頁索引: 建立函式(page)}，第一次切換到該分頁時才建立內容
+    (每個圖表分頁各自建立 Figure 與 NavigationToolbar，未檢視的分頁不必建立)
+    """
+    def build(index):
+        builder = builders.pop(index, None)
+        if builder is not None:
+            builder(tabs.widget(index))
+    tabs.currentChanged.connect(build)
+
+
+class HoverAnnotationBlitter:
+    """
+    Tooltip 註解的 blitting 重繪
+    畫布完整繪製後保存背景，滑鼠移動時只還原背景並重畫註解，不觸發整張圖重繪
+    (背景尚未建立或已失效時退回 draw_idle)
+    """
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.annot = None
+        self._background = None
+        canvas.mpl_connect("draw_event", self._on_draw)
+
+    def set_annotation(self, annot):
+        """指定要以 blitting 更新的註解 (重新繪圖後呼叫，舊背景隨之作廢)"""
+        annot.set_animated(True)
+        self.annot = annot
+        self._background = None
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        if self.annot is not None and self.annot.get_visible():
+            self.annot.axes.draw_artist(self.annot)
+
+    def refresh(self):
+        if self._background is None or self.annot is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        if self.annot.get_visible():
+            self.annot.axes.draw_artist(self.annot)
+        self.canvas.blit(self.canvas.figure.bbox)
 
 
 class VersionDialog(QDialog):
@@ -97,50 +667,95 @@ class VersionDialog(QDialog):
 
 
 class DistributionPlotDialog(QDialog):
-    """詳細分佈與趨勢分析圖表對話框"""
-    def __init__(self, item_name, df_item, design_val, upper_tol, lower_tol, parent=None, theme='light'):
+    """
+    詳細分佈與趨勢分析圖表對話框
+    由主視窗建立一次後重複使用：Figure/Canvas 只建立一次，切換測項時透過 set_item 重繪
+    各分頁延遲到第一次顯示時才繪製，未切換到的分頁不做計算
+    """
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.setWindowTitle(f"詳細分析: {item_name}")
         self.setGeometry(100, 100, 950, 650)
-        self.item_name = item_name
-        self.df_item = df_item
-        self.design_val = design_val
-        self.upper_tol = upper_tol
-        self.lower_tol = lower_tol
-        # [v2.0.1 修正] 補回 usl 與 lsl 定義，防止崩潰
-        self.usl = design_val + upper_tol
-        self.lsl = design_val + lower_tol
-        self.theme = theme
-        
-        # 設定 Style
-        if self.theme == 'dark':
-            plt.style.use('dark_background')
-        else:
-            plt.style.use('default')
-            
-        # [v2.0.2 關鍵修正] 設定 Style 後必須重新套用中文字型，否則會被覆蓋回預設值
-        set_chinese_font()
+        self.item_name = ""
+        self.df_item = pd.DataFrame()
+        self.design_val = 0.0
+        self.upper_tol = 0.0
+        self.lower_tol = 0.0
+        self.usl = 0.0
+        self.lsl = 0.0
+        self.theme = None
+        self._measured = np.array([])        # 實測值 (float64，無法轉換者為 NaN)
+        self._measured_valid = np.array([])  # 去除 NaN 後的實測值
+        self._tol_cache = {}  # 目標良率 → 公差計算結果 (切換測項時清除)
+        self._shown_yield_idx = -1  # 目前報告對應的良率選項 (切換測項時重設)
 
         layout = QVBoxLayout(self)
-        tabs = QTabWidget()
-        layout.addWidget(tabs)
+        self.tabs = QTabWidget()
+        layout.addWidget(self.tabs)
         
         self.tab_hist = QWidget()
-        self.plot_histogram(self.tab_hist)
-        tabs.addTab(self.tab_hist, "分佈直方圖")
+        self.setup_histogram_tab(self.tab_hist)
+        self.tabs.addTab(self.tab_hist, "分佈直方圖")
         
         self.tab_trend = QWidget()
-        self.plot_trend(self.tab_trend)
-        tabs.addTab(self.tab_trend, "趨勢圖")
+        self.setup_trend_tab(self.tab_trend)
+        self.tabs.addTab(self.tab_trend, "趨勢圖")
         
         # [v2.3.0] 新增公差建議分頁
         self.tab_tolerance = QWidget()
         self.setup_tolerance_tab(self.tab_tolerance)
-        tabs.addTab(self.tab_tolerance, "📐 公差建議")
+        self.tabs.addTab(self.tab_tolerance, "📐 公差建議")
+        
+        # 分頁索引 → 繪製函式；_stale_tabs 記錄切換測項後尚未重繪的分頁
+        self._tab_renderers = [self.plot_histogram, self.plot_trend, self.update_tolerance_display]
+        self._stale_tabs = set()
+        self.tabs.currentChanged.connect(self._render_tab)
         
         btn = QPushButton("關閉")
         btn.clicked.connect(self.close)
         layout.addWidget(btn)
+
+    def set_item(self, item_name, df_item, design_val, upper_tol, lower_tol, theme='light'):
+        """切換顯示的測項並重繪所有分頁"""
+        self.setWindowTitle(f"詳細分析: {item_name}")
+        self.item_name = item_name
+        self.df_item = df_item
+        self.design_val = design_val
+        self.upper_tol = upper_tol
+        self.lower_tol = lower_tol
+        # [v2.0.1 修正] 補回 usl 與 lsl 定義，防止崩潰
+        self.usl = design_val + upper_tol
+        self.lsl = design_val + lower_tol
+        # 實測值只在切換測項時轉換一次，各分頁直接使用 ndarray
+        self._measured = pd.to_numeric(df_item[AppConfig.Columns.MEASURED], errors='coerce').to_numpy(dtype=np.float64)
+        self._measured_valid = self._measured[~np.isnan(self._measured)]
+        self._tol_cache = {}
+        self._shown_yield_idx = -1
+        
+        # 設定 Style
+        apply_plot_style(theme)
+        
+        if theme != self.theme:
+            # 主題變更時依新樣式重建座標軸 (同主題則沿用，僅在繪圖時 ax.clear)
+            for fig in (self.fig_hist, self.fig_trend):
+                fig.set_facecolor(matplotlib.rcParams['figure.facecolor'])
+                fig.clear()
+            self.ax_hist = self.fig_hist.add_subplot(111)
+            self.ax_trend = self.fig_trend.add_subplot(111)
+            self.theme = theme
+        
+        self.yield_combo.blockSignals(True)
+        self.yield_combo.setCurrentIndex(2)  # 預設 90%
+        self.yield_combo.blockSignals(False)
+        
+        self._stale_tabs = set(range(len(self._tab_renderers)))
+        self.tabs.setCurrentIndex(0)
+        self._render_tab(0)  # 已在第一個分頁時 setCurrentIndex 不會觸發 currentChanged
+    
+    def _render_tab(self, index):
+        """繪製尚未更新的分頁 (分頁切換時呼叫)"""
+        if index in self._stale_tabs:
+            self._stale_tabs.discard(index)
+            self._tab_renderers[index]()
     
     def setup_tolerance_tab(self, parent_widget):
         """設定公差建議分頁"""
@@ -173,86 +788,92 @@ class DistributionPlotDialog(QDialog):
         
         result_group.setLayout(result_layout)
         layout.addWidget(result_group)
-        
-        # 初始計算
-        self.update_tolerance_display()
     
     def update_tolerance_display(self):
         """更新公差計算結果顯示"""
+        yield_idx = self.yield_combo.currentIndex()
+        if yield_idx == self._shown_yield_idx:
+            return  # 報告已是此良率的結果
+        self._shown_yield_idx = yield_idx
         yield_map = {0: 0.80, 1: 0.85, 2: 0.90, 3: 0.95, 4: 0.99, 5: 0.9973}
-        target_yield = yield_map.get(self.yield_combo.currentIndex(), 0.90)
-        
-        vals = pd.to_numeric(self.df_item[AppConfig.Columns.MEASURED], errors='coerce').dropna()
-        result = calculate_tolerance_for_yield(vals, self.design_val, target_yield)
+        target_yield = yield_map.get(yield_idx, 0.90)
         
-        # 格式化輸出
-        lines = []
-        lines.append(f"═══════════════════════════════════════")
-        lines.append(f"  測量專案：{self.item_name}")
-        lines.append(f"  目標良率：{target_yield * 100:.2f}%")
-        lines.append(f"═══════════════════════════════════════")
-        lines.append("")
+        vals = self._measured_valid
+        result = self._tol_cache.get(target_yield)
+        if result is None:
+            result = self._tol_cache[target_yield] = calculate_tolerance_for_yield(vals, self.design_val, target_yield)
         
+        # 依可靠性選擇報告樣板，一次格式化輸出
+        ctx = {'item_name': self.item_name, 'yield_pct': target_yield * 100}
         if result['reliability'] == 'invalid':
-            lines.append("❌ 無法計算：數據不足 (需至少 2 個樣本)")
+            text = _TOL_INVALID_TMPL.format_map(ctx)
         elif result['reliability'] == 'zero_std':
-            lines.append("❌ 無法計算：標準差為零 (所有數據相同)")
+            text = _TOL_ZERO_STD_TMPL.format_map(ctx)
         else:
-            lines.append("📊 【數據統計】")
-            lines.append(f"   樣本數：{len(vals)}")
-            lines.append(f"   平均值 (μ)：{result['mean']:.4f}")
-            lines.append(f"   標準差 (σ)：{result['std']:.4f}")
-            lines.append(f"   設計值：{self.design_val:.4f}")
-            lines.append(f"   製程偏移：{result['offset']:+.4f}")
-            lines.append("")
-            
-            lines.append("📐 【建議公差】")
-            lines.append(f"   ✅ 對稱公差：±{result['symmetric_tol']:.4f}")
-            lines.append("")
-            lines.append(f"   📈 非對稱建議：")
-            lines.append(f"      上限公差：+{result['upper_tol']:.4f}")
-            lines.append(f"      下限公差：{result['lower_tol']:.4f}")
-            lines.append("")
-            
-            lines.append("📋 【與當前規格比較】")
-            lines.append(f"   當前上限：+{self.upper_tol:.4f}")
-            lines.append(f"   當前下限：{self.lower_tol:.4f}")
-            
+            ctx.update(result, count=len(vals), design_val=self.design_val,
+                       current_upper=self.upper_tol, current_lower=self.lower_tol, advice="", note="")
             current_max_tol = max(abs(self.upper_tol), abs(self.lower_tol))
             if current_max_tol > 0:
                 ratio = result['symmetric_tol'] / current_max_tol
                 if ratio > 1.2:
-                    lines.append("")
-                    lines.append(f"   ⚠️ 警告：要達到 {target_yield*100:.0f}% 良率，")
-                    lines.append(f"      建議公差比當前規格大 {(ratio-1)*100:.1f}%")
-                    lines.append(f"      建議放寬規格或改善製程")
+                    ctx['advice'] = _TOL_ADVICE_WIDEN.format(yield_pct=ctx['yield_pct'], over_pct=(ratio - 1) * 100)
                 elif ratio < 0.8:
-                    lines.append("")
-                    lines.append(f"   ✅ 良好：當前規格充裕，")
-                    lines.append(f"      實際只需 {ratio*100:.1f}% 即可達標")
+                    ctx['advice'] = _TOL_ADVICE_LOOSE.format(ratio_pct=ratio * 100)
                 else:
-                    lines.append("")
-                    lines.append(f"   ℹ️ 規格適中 (比例：{ratio*100:.1f}%)")
-            
+                    ctx['advice'] = _TOL_ADVICE_OK.format(ratio_pct=ratio * 100)
             if result['reliability'] == 'small_sample':
-                lines.append("")
-                lines.append("⚠️ 注意：樣本數少於 30，結果僅供參考")
-                lines.append("   建議累積更多數據後再做決策")
+                ctx['note'] = _TOL_SMALL_SAMPLE_NOTE
+            text = _TOL_OK_TMPL.format_map(ctx)
         
-        self.tol_result_text.setPlainText("\n".join(lines))
+        # 替換整份報告期間暫停重繪，版面配置完成後只重繪一次
+        self.tol_result_text.setUpdatesEnabled(False)
+        self.tol_result_text.setPlainText(text)
+        self.tol_result_text.setUpdatesEnabled(True)
 
-    def plot_histogram(self, parent_widget):
+    def setup_histogram_tab(self, parent_widget):
         layout = QVBoxLayout(parent_widget)
-        fig = Figure(figsize=(8, 6), dpi=100)
-        canvas = FigureCanvas(fig)
-        toolbar = NavigationToolbar(canvas, parent_widget)
-        ax = fig.add_subplot(111)
+        self.fig_hist = Figure(figsize=(8, 6), dpi=100)
+        self.canvas_hist = FigureCanvas(self.fig_hist)
+        toolbar = NavigationToolbar(self.canvas_hist, parent_widget)
+        self.ax_hist = self.fig_hist.add_subplot(111)
+        layout.addWidget(toolbar)
+        layout.addWidget(self.canvas_hist)
+
+    def setup_trend_tab(self, parent_widget):
+        layout = QVBoxLayout(parent_widget)
+        self.fig_trend = Figure(figsize=(8, 6), dpi=100)
+        self.canvas_trend = FigureCanvas(self.fig_trend)
+        toolbar = NavigationToolbar(self.canvas_trend, parent_widget)
+        self.ax_trend = self.fig_trend.add_subplot(111)
+        
+        # 目前繪製的趨勢線與 Tooltip 資料 (由 plot_trend 更新)
+        self.trend_line = None
+        self.trend_annot = None
+        self.trend_y = np.array([])
+        self.trend_idx = np.arange(0)  # 繪製點 → 原始資料索引 (降採樣時使用)
+        self.trend_filenames = []
+        self.trend_times = np.array([], dtype='datetime64[ns]')
+        self._trend_time_cache = {}  # 索引 → 時間字串 (僅滑鼠停留過的點才格式化)
+        self.trend_blitter = HoverAnnotationBlitter(self.canvas_trend)
+        self.canvas_trend.mpl_connect("motion_notify_event", self.on_trend_hover)
         
-        data = self.df_item[AppConfig.Columns.MEASURED].dropna()
+        layout.addWidget(toolbar)
+        layout.addWidget(self.canvas_trend)
+
+    def plot_histogram(self):
+        ax = self.ax_hist
+        ax.clear()
+        
+        data = self._measured_valid
         if len(data) > 0:
             color = 'cyan' if self.theme == 'dark' else 'skyblue'
             edgecolor = 'white' if self.theme == 'dark' else 'black'
-            ax.hist(data, bins=15, color=color, edgecolor=edgecolor, alpha=0.7, label='實測值')
+            # 先以 np.histogram 分箱，再以 bar 繪製 (與 ax.hist 外觀相同，省去 Matplotlib 的輸入轉換)
+            # 圖例與 ax.hist 相同只標記第一個矩形，使其維持在參考線之前
+            counts, edges = np.histogram(data, bins=15)
+            bars = ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+                          color=color, edgecolor=edgecolor, alpha=0.7)
+            bars.patches[0].set_label('實測值')
             ax.axvline(self.design_val, color='lime' if self.theme=='dark' else 'green', linestyle='-', linewidth=2, label='設計值')
             ax.axvline(self.usl, color='red', linestyle='--', linewidth=2, label='USL')
             ax.axvline(self.lsl, color='red', linestyle='--', linewidth=2, label='LSL')
@@ -261,34 +882,48 @@ class DistributionPlotDialog(QDialog):
             ax.grid(True, alpha=0.3)
         else:
             ax.text(0.5, 0.5, "無有效數據", ha='center', va='center')
-        layout.addWidget(toolbar)
-        layout.addWidget(canvas)
+        self.canvas_hist.draw_idle()
 
-    def plot_trend(self, parent_widget):
-        layout = QVBoxLayout(parent_widget)
-        fig = Figure(figsize=(8, 6), dpi=100)
-        canvas = FigureCanvas(fig)
-        toolbar = NavigationToolbar(canvas, parent_widget)
-        ax = fig.add_subplot(111)
+    def plot_trend(self):
+        ax = self.ax_trend
+        ax.clear()
         
-        df_sorted = self.df_item.copy()
+        df = self.df_item
+        # 只計算依時間排序的列順序，各欄以陣列索引取用，不複製整個 DataFrame
+        order = np.arange(len(df))
         has_time = False
-        if AppConfig.Columns.TIME in df_sorted.columns:
-            try:
-                if len(df_sorted[AppConfig.Columns.TIME].dropna()) > 0:
-                    df_sorted = df_sorted.sort_values(by=AppConfig.Columns.TIME)
-                    has_time = True
-            except: pass
-        
-        y_data = df_sorted[AppConfig.Columns.MEASURED].values
+        times = np.array([], dtype='datetime64[ns]')
+        time_col = df.get(AppConfig.Columns.TIME)
+        if time_col is not None and time_col.notna().any():
+            # 測量時間通常已是 datetime64，僅在其他型別時才以 coerce 轉換
+            if not pd.api.types.is_datetime64_any_dtype(time_col.dtype):
+                time_col = pd.to_datetime(time_col, errors='coerce')
+            times = time_col.to_numpy(dtype='datetime64[ns]')
+            if not np.isnat(times).all():
+                order = np.argsort(times, kind='stable')
+                has_time = True
+        
+        y_data = self._measured[order]
         x_data = np.arange(1, len(y_data) + 1)
         
         # Prepare data for tooltip
-        filenames = df_sorted[AppConfig.Columns.FILE].values if AppConfig.Columns.FILE in df_sorted.columns else []
-        times = df_sorted[AppConfig.Columns.TIME].values if AppConfig.Columns.TIME in df_sorted.columns else []
-        
+        self.trend_y = y_data
+        self.trend_filenames = df[AppConfig.Columns.FILE].to_numpy()[order].tolist() if AppConfig.Columns.FILE in df.columns else []
+        # 時間字串延遲到滑鼠停留時才逐點格式化並快取
+        self.trend_times = times[order] if len(times) else times
+        self._trend_time_cache = {}
+        
+        # 點數過多時只繪製 LTTB 保留的點，Tooltip 資料仍保留完整陣列
+        self.trend_idx = lttb_indices(x_data, y_data, _TREND_MAX_POINTS)
         line_color = 'cyan' if self.theme == 'dark' else 'blue'
-        line, = ax.plot(x_data, y_data, marker='o', linestyle='-', color=line_color, markersize=4, label='實測值')
+        px, py = x_data[self.trend_idx], np.asarray(y_data[self.trend_idx], dtype=np.float64)
+        # 連線以逐段 LineCollection 繪製 (量測值上下跳動時，單一長折線的轉角接合在 Agg 上較慢)，
+        # 圓點另以無連線的 Line2D 繪製並供 Tooltip 命中測試
+        if len(px) > 1:
+            segments = np.stack([np.column_stack([px[:-1], py[:-1]]), np.column_stack([px[1:], py[1:]])], axis=1)
+            ax.add_collection(LineCollection(segments, colors=line_color))
+        self.trend_line, = ax.plot(px, py, marker='o', linestyle='none', color=line_color, markersize=4)
+        ax.plot([], [], marker='o', linestyle='-', color=line_color, markersize=4, label='實測值')  # 圖例樣式
         
         ax.axhline(self.design_val, color='lime' if self.theme=='dark' else 'green', linestyle='-', alpha=0.5, label='設計值')
         ax.axhline(self.usl, color='red', linestyle='--', alpha=0.5, label='USL')
@@ -300,52 +935,61 @@ class DistributionPlotDialog(QDialog):
         ax.grid(True, alpha=0.3)
         
         # --- Tooltip Implementation ---
-        annot = ax.annotate("", xy=(0,0), xytext=(10,10),textcoords="offset points",
-                            bbox=dict(boxstyle="round", fc="w", alpha=0.9),
-                            arrowprops=dict(arrowstyle="->"))
-        annot.set_visible(False)
-
-        def update_annot(ind):
-            x, y = line.get_data()
-            idx = ind["ind"][0]
-            annot.xy = (x[idx], y[idx])
-            
-            val = y_data[idx]
-            fname = filenames[idx] if len(filenames) > idx else "Unknown"
-            
-            time_str = ""
-            if len(times) > idx:
-                t = times[idx]
-                if pd.notnull(t):
-                    try:
-                        time_str = pd.to_datetime(t).strftime("%Y/%m/%d %H:%M:%S")
-                    except: pass
+        # Tooltip 內容為檔名與數值，關閉 mathtext 解析 (檔名含 $ 時也不會被當成數學式)
+        self.trend_annot = ax.annotate("", xy=(0,0), xytext=(10,10),textcoords="offset points",
+                                       bbox=dict(boxstyle="round", fc="w", alpha=0.9),
+                                       arrowprops=dict(arrowstyle="->"), parse_math=False)
+        self.trend_annot.set_visible(False)
+        self.trend_blitter.set_annotation(self.trend_annot)
+        self._trend_hover_point = None
+        self.canvas_trend.draw_idle()
+
+    def update_trend_annot(self, ind):
+        x, y = self.trend_line.get_data()
+        point = ind["ind"][0]
+        self.trend_annot.xy = (x[point], y[point])
+        idx = self.trend_idx[point]
+        
+        val = self.trend_y[idx]
+        fname = self.trend_filenames[idx] if len(self.trend_filenames) > idx else "Unknown"
+        
+        time_str = self._trend_time_cache.get(idx)
+        if time_str is None:
+            time_str = self._trend_time_cache[idx] = self._format_trend_time(idx)
+        
+        # Format text
+        text = f"File: {fname}\nValue: {val:.4f}"
+        if time_str:
+            text += f"\nTime: {time_str}"
             
-            # Format text
-            text = f"File: {fname}\nValue: {val:.4f}"
-            if time_str:
-                text += f"\nTime: {time_str}"
-                
-            annot.set_text(text)
-
-        def hover(event):
-            vis = annot.get_visible()
-            if event.inaxes == ax:
-                cont, ind = line.contains(event)
-                if cont:
-                    update_annot(ind)
-                    annot.set_visible(True)
-                    canvas.draw_idle()
-                else:
-                    if vis:
-                        annot.set_visible(False)
-                        canvas.draw_idle()
+        self.trend_annot.set_text(text)
 
-        canvas.mpl_connect("motion_notify_event", hover)
-        # ------------------------------
+    def _format_trend_time(self, idx):
+        if idx >= len(self.trend_times) or np.isnat(self.trend_times[idx]):
+            return ""
+        return pd.Timestamp(self.trend_times[idx]).strftime("%Y/%m/%d %H:%M:%S")
 
-        layout.addWidget(toolbar)
-        layout.addWidget(canvas)
+    def on_trend_hover(self, event):
+        if self.trend_line is None: return
+        annot = self.trend_annot
+        vis = annot.get_visible()
+        if event.inaxes == self.ax_trend:
+            cont, ind = line_contains_sorted(self.trend_line, event)
+            if cont:
+                # 滑鼠仍停在同一點時 Tooltip 內容不變，不必重繪
+                point = ind["ind"][0]
+                if vis and point == self._trend_hover_point:
+                    return
+                self._trend_hover_point = point
+                self.update_trend_annot(ind)
+                annot.set_visible(True)
+                self.trend_blitter.refresh()
+            else:
+                if vis:
+                    self._trend_hover_point = None
+                    annot.set_visible(False)
+                    self.trend_blitter.refresh()
+        # ------------------------------
 
 
 class XYScatterPlotDialog(QDialog):
@@ -367,13 +1011,18 @@ class XYScatterPlotDialog(QDialog):
         self.xy_data = xy_data
         self.radial_tolerance = radial_tolerance
         self.theme = theme
+        # 偏差與 NG 狀態轉為平行陣列，更新公差時整批重新判定
+        n = len(xy_data)
+        self._dx = np.fromiter(map(_get_dx, xy_data), dtype=np.float64, count=n)
+        self._dy = np.fromiter(map(_get_dy, xy_data), dtype=np.float64, count=n)
+        self._is_ng = np.fromiter((bool(d.get('is_ng', False)) for d in xy_data), dtype=bool, count=n)
+        # 徑向偏差與其平均/標準差只算一次，供直方圖、趨勢圖與統計摘要共用
+        self._radial = np.hypot(self._dx, self._dy)
+        self._radial_mean = self._radial.mean() if n else np.nan
+        self._radial_std = self._radial.std() if n else np.nan
         
         # 設定 Style
-        if self.theme == 'dark':
-            plt.style.use('dark_background')
-        else:
-            plt.style.use('default')
-        set_chinese_font()
+        apply_plot_style(self.theme)
         
         self.init_ui()
     
@@ -387,20 +1036,20 @@ class XYScatterPlotDialog(QDialog):
         self.plot_scatter(self.tab_scatter)
         tabs.addTab(self.tab_scatter, "📍 XY 分佈圖")
         
-        # [v2.5.0] 徑向偏差直方圖頁籤
+        # [v2.5.0] 徑向偏差直方圖頁籤 (與趨勢圖頁籤皆於第一次切換時才繪製)
         self.tab_hist = QWidget()
-        self.plot_radial_histogram(self.tab_hist)
         tabs.addTab(self.tab_hist, "📊 分佈直方圖")
         
         # [v2.5.0] 趨勢圖頁籤
         self.tab_trend = QWidget()
-        self.plot_radial_trend(self.tab_trend)
         tabs.addTab(self.tab_trend, "📈 趨勢圖")
         
         # 統計摘要頁籤
         self.tab_stats = QWidget()
         self.setup_stats_tab(self.tab_stats)
         tabs.addTab(self.tab_stats, "📋 統計摘要")
+        connect_lazy_tabs(tabs, {tabs.indexOf(self.tab_hist): self.plot_radial_histogram,
+                                 tabs.indexOf(self.tab_trend): self.plot_radial_trend})
         
         btn = QPushButton("關閉")
         btn.clicked.connect(self.close)
@@ -459,51 +1108,38 @@ class XYScatterPlotDialog(QDialog):
         
         # 重新計算 NG 狀態
         # 假設 xy_data 中 dx, dy 單位已是 mm (或與公差一致)
-        ng_count = 0
-        for d in self.xy_data:
-            r = np.sqrt(d['dx']**2 + d['dy']**2)
-            is_ng = r > new_tol
-            d['is_ng'] = is_ng
-            if is_ng: ng_count += 1
-            
-        self.draw_scatter()
+        self._is_ng = np.hypot(self._dx, self._dy) > new_tol
         
-        # [Optional] 更新標題或其他資訊已反映新的 NG 數
-        # self.setWindowTitle(f"2D 位置分佈圖: {self.group_name} (NG: {ng_count})")
+        # 已有公差圓時只更新既有圖元的資料與圖例，不重建整個座標軸
+        if self._art_circle is None:
+            self.draw_scatter()
+        else:
+            self._refresh_scatter()
+            self.toolbar_scatter.update()  # 顯示範圍已重設，清除工具列的縮放/平移記錄
+            self.canvas_scatter.draw_idle()
 
     def draw_scatter(self):
         """執行繪圖邏輯"""
         self.fig_scatter.clear()
-        ax = self.fig_scatter.add_subplot(111)
+        ax = self.ax_scatter = self.fig_scatter.add_subplot(111)
         
         # 設定等比例軸
         ax.set_aspect('equal', adjustable='box')
         
-        # 繪製公差圓
-        tol = self.radial_tolerance
-        if tol > 0:
+        # 繪製公差圓 (半徑與標籤由 _refresh_scatter 設定)
+        self._art_circle = self._art_circle_edge = None
+        if self.radial_tolerance > 0:
             # 公差圓（綠色填充）
-            circle = plt.Circle((0, 0), tol, color='lightgreen', alpha=0.3, label=f'公差圓 (r={tol:.4f})')
-            ax.add_patch(circle)
+            self._art_circle = plt.Circle((0, 0), self.radial_tolerance, color='lightgreen', alpha=0.3)
+            ax.add_patch(self._art_circle)
             # 公差圓邊界
-            circle_edge = plt.Circle((0, 0), tol, color='green', fill=False, linewidth=2)
-            ax.add_patch(circle_edge)
-        
-        # 繪製數據點
-        dx_ok = [d['dx'] for d in self.xy_data if not d.get('is_ng', False)]
-        dy_ok = [d['dy'] for d in self.xy_data if not d.get('is_ng', False)]
-        dx_ng = [d['dx'] for d in self.xy_data if d.get('is_ng', False)]
-        dy_ng = [d['dy'] for d in self.xy_data if d.get('is_ng', False)]
+            self._art_circle_edge = plt.Circle((0, 0), self.radial_tolerance, color='green', fill=False, linewidth=2)
+            ax.add_patch(self._art_circle_edge)
         
-        # 計算新的比例
-        total = len(self.xy_data)
-        ok_ratio = len(dx_ok) / total * 100 if total > 0 else 0
-        ng_ratio = len(dx_ng) / total * 100 if total > 0 else 0
-        
-        if dx_ok:
-            ax.scatter(dx_ok, dy_ok, c='blue', s=50, alpha=0.7, label=f'合格: {len(dx_ok)} ({ok_ratio:.1f}%)', zorder=5)
-        if dx_ng:
-            ax.scatter(dx_ng, dy_ng, c='red', s=80, alpha=0.9, marker='x', label=f'超標: {len(dx_ng)} ({ng_ratio:.1f}%)', zorder=6)
+        # 合格/超標兩組散點先建立空的圖元，座標與圖例標籤由 _refresh_scatter 依 NG 遮罩填入
+        rasterized = len(self._dx) > _SCATTER_RASTER_MIN_POINTS
+        self._art_ok = ax.scatter([], [], c='blue', s=50, alpha=0.7, zorder=5, rasterized=rasterized)
+        self._art_ng = ax.scatter([], [], c='red', s=80, alpha=0.9, marker='x', zorder=6, rasterized=rasterized)
         
         # 繪製原點標記
         ax.scatter([0], [0], c='green', s=100, marker='+', linewidths=2, label='設計中心', zorder=7)
@@ -512,24 +1148,47 @@ class XYScatterPlotDialog(QDialog):
         ax.axhline(0, color='gray', linestyle='--', linewidth=0.5, alpha=0.5)
         ax.axvline(0, color='gray', linestyle='--', linewidth=0.5, alpha=0.5)
         
-        # 設定範圍（確保能看到所有點和公差圓）
-        all_dx = [d['dx'] for d in self.xy_data]
-        all_dy = [d['dy'] for d in self.xy_data]
-        if all_dx and all_dy:
-            max_range = max(max(abs(min(all_dx)), abs(max(all_dx)), tol),
-                           max(abs(min(all_dy)), abs(max(all_dy)), tol)) * 1.3
-            ax.set_xlim(-max_range, max_range)
-            ax.set_ylim(-max_range, max_range)
-        
         ax.set_xlabel('X 偏差 (ΔX)')
         ax.set_ylabel('Y 偏差 (ΔY)')
         # self.group_name 可能包含 " (2D合併)"，視情況簡化
         ax.set_title(f'{self.group_name} - XY 位置分佈')
-        ax.legend(loc='upper right')
         ax.grid(True, alpha=0.3)
         
+        self._refresh_scatter()
         self.canvas_scatter.draw()
     
+    def _refresh_scatter(self):
+        """依目前公差與 NG 遮罩更新公差圓、散點座標、顯示範圍與圖例"""
+        ax = self.ax_scatter
+        tol = self.radial_tolerance
+        if self._art_circle is not None:
+            self._art_circle.set_radius(tol)
+            self._art_circle_edge.set_radius(tol)
+            self._art_circle.set_label(f'公差圓 (r={tol:.4f})')
+        
+        # 以 NG 遮罩切出合格/超標兩組
+        ok, ng = ~self._is_ng, self._is_ng
+        n_ok, n_ng = int(ok.sum()), int(ng.sum())
+        
+        # 計算新的比例
+        total = len(self._is_ng)
+        ok_ratio = n_ok / total * 100 if total > 0 else 0
+        ng_ratio = n_ng / total * 100 if total > 0 else 0
+        
+        # 沒有點的一組以底線開頭的標籤排除在圖例之外
+        self._art_ok.set_offsets(np.column_stack((self._dx[ok], self._dy[ok])))
+        self._art_ok.set_label(f'合格: {n_ok} ({ok_ratio:.1f}%)' if n_ok else '_ok')
+        self._art_ng.set_offsets(np.column_stack((self._dx[ng], self._dy[ng])))
+        self._art_ng.set_label(f'超標: {n_ng} ({ng_ratio:.1f}%)' if n_ng else '_ng')
+        
+        # 設定範圍（確保能看到所有點和公差圓）
+        if len(self._dx):
+            max_range = max(np.abs(self._dx).max(), np.abs(self._dy).max(), tol) * 1.3
+            ax.set_xlim(-max_range, max_range)
+            ax.set_ylim(-max_range, max_range)
+        
+        ax.legend(loc='upper right')
+    
     def plot_radial_histogram(self, parent_widget):
         """[v2.5.0] 繪製徑向偏差直方圖"""
         layout = QVBoxLayout(parent_widget)
@@ -539,13 +1198,16 @@ class XYScatterPlotDialog(QDialog):
         toolbar = NavigationToolbar(canvas, parent_widget)
         ax = fig.add_subplot(111)
         
-        # 計算徑向偏差
-        radial_vals = np.array([np.sqrt(d['dx']**2 + d['dy']**2) for d in self.xy_data])
+        radial_vals = self._radial
         
         if len(radial_vals) > 0:
             color = 'cyan' if self.theme == 'dark' else 'skyblue'
             edgecolor = 'white' if self.theme == 'dark' else 'black'
-            ax.hist(radial_vals, bins=15, color=color, edgecolor=edgecolor, alpha=0.7, label='徑向偏差')
+            # 先以 np.histogram 分箱再以 bar 繪製，與分佈圖的直方圖作法一致
+            counts, edges = np.histogram(radial_vals, bins=15)
+            bars = ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+                          color=color, edgecolor=edgecolor, alpha=0.7)
+            bars.patches[0].set_label('徑向偏差')
             
             # 繪製公差線
             if self.radial_tolerance > 0:
@@ -553,8 +1215,8 @@ class XYScatterPlotDialog(QDialog):
                           label=f'徑向公差 ({self.radial_tolerance:.4f})')
             
             # 繪製平均線
-            ax.axvline(radial_vals.mean(), color='lime' if self.theme=='dark' else 'green', 
-                      linestyle='-', linewidth=2, label=f'平均 ({radial_vals.mean():.4f})')
+            ax.axvline(self._radial_mean, color='lime' if self.theme=='dark' else 'green', 
+                      linestyle='-', linewidth=2, label=f'平均 ({self._radial_mean:.4f})')
             
             ax.set_title("徑向偏差分佈圖")
             ax.set_xlabel("徑向偏差")
@@ -576,14 +1238,15 @@ class XYScatterPlotDialog(QDialog):
         toolbar = NavigationToolbar(canvas, parent_widget)
         ax = fig.add_subplot(111)
         
-        # 計算徑向偏差
-        radial_vals = np.array([np.sqrt(d['dx']**2 + d['dy']**2) for d in self.xy_data])
+        radial_vals = self._radial
         filenames = [d.get('file', '') for d in self.xy_data]
         x_data = np.arange(1, len(radial_vals) + 1)
         
         if len(radial_vals) > 0:
             line_color = 'cyan' if self.theme == 'dark' else 'blue'
-            line, = ax.plot(x_data, radial_vals, marker='o', linestyle='-', color=line_color, 
+            # 點數過多時與分佈圖趨勢圖相同以 LTTB 降採樣，Tooltip 仍對應原始樣本
+            plot_idx = lttb_indices(x_data, radial_vals, _TREND_MAX_POINTS)
+            line, = ax.plot(x_data[plot_idx], radial_vals[plot_idx], marker='o', linestyle='-', color=line_color, 
                            markersize=4, label='徑向偏差')
             
             # 繪製公差線
@@ -592,8 +1255,8 @@ class XYScatterPlotDialog(QDialog):
                           label=f'徑向公差 ({self.radial_tolerance:.4f})')
             
             # 繪製平均線
-            ax.axhline(radial_vals.mean(), color='lime' if self.theme=='dark' else 'green', 
-                      linestyle='-', alpha=0.5, label=f'平均 ({radial_vals.mean():.4f})')
+            ax.axhline(self._radial_mean, color='lime' if self.theme=='dark' else 'green', 
+                      linestyle='-', alpha=0.5, label=f'平均 ({self._radial_mean:.4f})')
             
             ax.set_title("徑向偏差趨勢圖")
             ax.set_xlabel("樣本序號")
@@ -604,28 +1267,37 @@ class XYScatterPlotDialog(QDialog):
             # Tooltip
             annot = ax.annotate("", xy=(0,0), xytext=(10,10), textcoords="offset points",
                                bbox=dict(boxstyle="round", fc="w", alpha=0.9),
-                               arrowprops=dict(arrowstyle="->"))
+                               arrowprops=dict(arrowstyle="->"), parse_math=False)
             annot.set_visible(False)
+            blitter = HoverAnnotationBlitter(canvas)
+            blitter.set_annotation(annot)
+            hover_point = None
             
             def update_annot(ind):
-                idx = ind["ind"][0]
+                idx = plot_idx[ind["ind"][0]]
                 annot.xy = (x_data[idx], radial_vals[idx])
                 fname = filenames[idx] if idx < len(filenames) else "Unknown"
                 text = f"File: {fname}\nRadial: {radial_vals[idx]:.4f}"
                 annot.set_text(text)
             
             def hover(event):
+                nonlocal hover_point
                 vis = annot.get_visible()
                 if event.inaxes == ax:
-                    cont, ind = line.contains(event)
+                    cont, ind = line_contains_sorted(line, event)
                     if cont:
+                        # 滑鼠仍停在同一點時不重繪
+                        if vis and ind["ind"][0] == hover_point:
+                            return
+                        hover_point = ind["ind"][0]
                         update_annot(ind)
                         annot.set_visible(True)
-                        canvas.draw_idle()
+                        blitter.refresh()
                     else:
                         if vis:
+                            hover_point = None
                             annot.set_visible(False)
-                            canvas.draw_idle()
+                            blitter.refresh()
             
             canvas.mpl_connect("motion_notify_event", hover)
         else:
@@ -643,10 +1315,10 @@ class XYScatterPlotDialog(QDialog):
         
         # 計算統計
         n = len(self.xy_data)
-        dx_vals = np.array([d['dx'] for d in self.xy_data])
-        dy_vals = np.array([d['dy'] for d in self.xy_data])
-        radial_vals = np.sqrt(dx_vals**2 + dy_vals**2)
-        ng_count = sum(1 for d in self.xy_data if d.get('is_ng', False))
+        dx_vals, dy_vals = self._dx, self._dy
+        radial_vals = self._radial
+        radial_mean, radial_std = self._radial_mean, self._radial_std
+        ng_count = int(self._is_ng.sum())
         
         lines = []
         lines.append("═══════════════════════════════════════")
@@ -669,20 +1341,20 @@ class XYScatterPlotDialog(QDialog):
         lines.append(f"   範圍：{dy_vals.min():.4f} ~ {dy_vals.max():.4f}")
         lines.append("")
         lines.append("📐 【徑向偏差】")
-        lines.append(f"   平均：{radial_vals.mean():.4f}")
+        lines.append(f"   平均：{radial_mean:.4f}")
         lines.append(f"   最大：{radial_vals.max():.4f}")
         lines.append(f"   最小：{radial_vals.min():.4f}")
-        lines.append(f"   標準差：{radial_vals.std():.4f}")
+        lines.append(f"   標準差：{radial_std:.4f}")
         lines.append("")
         lines.append(f"   徑向公差：{self.radial_tolerance:.4f}")
         
         # 單側 CPK (CPU)
-        if n > 1 and radial_vals.std() > 0:
-            cpu = (self.radial_tolerance - radial_vals.mean()) / (3 * radial_vals.std())
+        if n > 1 and radial_std > 0:
+            cpu = (self.radial_tolerance - radial_mean) / (3 * radial_std)
             lines.append("")
             lines.append("📈 【2D CPK (CPU)】")
             lines.append(f"   CPU = (USL - μ) / (3σ)")
-            lines.append(f"   CPU = ({self.radial_tolerance:.4f} - {radial_vals.mean():.4f}) / (3 × {radial_vals.std():.4f})")
+            lines.append(f"   CPU = ({self.radial_tolerance:.4f} - {radial_mean:.4f}) / (3 × {radial_std:.4f})")
             lines.append(f"   CPU = {cpu:.3f}")
             if cpu >= 1.33:
                 lines.append("   ✅ 製程能力優良 (CPU ≥ 1.33)")
@@ -729,13 +1401,12 @@ class ArrayHeatmapDialog(QDialog):
         self.group_name = group_name
         self.array_data = array_data
         self.theme = theme
+        # 點位索引與數值只轉換一次，供條形圖、熱力圖與統計摘要共用
+        self._indices = list(map(_get_index, array_data))
+        self._values = np.fromiter(map(_get_value, array_data), dtype=np.float64, count=len(array_data))
         
         # 設定 Style
-        if self.theme == 'dark':
-            plt.style.use('dark_background')
-        else:
-            plt.style.use('default')
-        set_chinese_font()
+        apply_plot_style(self.theme)
         
         self.init_ui()
     
@@ -749,15 +1420,15 @@ class ArrayHeatmapDialog(QDialog):
         self.plot_bar_chart(self.tab_bar)
         tabs.addTab(self.tab_bar, "📊 條形圖")
         
-        # [v2.5.0] 熱力圖頁籤
+        # [v2.5.0] 熱力圖頁籤 (第一次切換時才建立)
         self.tab_heatmap = QWidget()
-        self.plot_heatmap_ui(self.tab_heatmap)
         tabs.addTab(self.tab_heatmap, "🌡️ 2D 熱力圖")
         
         # 統計摘要頁籤
         self.tab_stats = QWidget()
         self.setup_stats_tab(self.tab_stats)
         tabs.addTab(self.tab_stats, "📋 統計摘要")
+        connect_lazy_tabs(tabs, {tabs.indexOf(self.tab_heatmap): self.plot_heatmap_ui})
         
         btn = QPushButton("關閉")
         btn.clicked.connect(self.close)
@@ -773,30 +1444,27 @@ class ArrayHeatmapDialog(QDialog):
         ax = fig.add_subplot(111)
         
         # 準備數據
-        indices = [d['index'] for d in self.array_data]
-        values = [d['value'] for d in self.array_data]
+        indices = self._indices
+        values = self._values
         
         if len(values) > 0:
             # 顏色映射
-            norm = plt.Normalize(min(values), max(values))
-            cmap = plt.cm.get_cmap('coolwarm')
+            norm = plt.Normalize(values.min(), values.max())
+            cmap = _CMAP_ARRAY
             colors = cmap(norm(values))
             
             bars = ax.bar(range(len(values)), values, color=colors, alpha=0.8)
-            ax.set_xticks(range(len(values)))
             
-            # 若點數太多，簡化 X 軸標籤
-            if len(indices) > 30:
-                n = len(indices)
-                step = n // 20
-                ax.set_xticks(range(0, n, step))
-                ax.set_xticklabels([indices[i] for i in range(0, n, step)], rotation=45)
-            else:
-                ax.set_xticklabels(indices, rotation=45)
+            # 若點數太多，簡化 X 軸標籤 (先決定間隔，只設定保留的刻度與標籤)
+            n = len(indices)
+            step = n // 20 if n > 30 else 1
+            positions = range(0, n, step)
+            ax.set_xticks(positions)
+            ax.set_xticklabels([indices[i] for i in positions], rotation=45)
             
             # 標記 Max/Min
-            min_idx = np.argmin(values)
-            max_idx = np.argmax(values)
+            min_idx = values.argmin()
+            max_idx = values.argmax()
             
             ax.annotate(f'Min: {values[min_idx]:.3f}', 
                         xy=(min_idx, values[min_idx]), 
@@ -837,7 +1505,7 @@ class ArrayHeatmapDialog(QDialog):
         # 自動猜測維度
         N = len(self.array_data)
         factors = []
-        for i in range(1, int(np.sqrt(N)) + 1):
+        for i in range(1, math.isqrt(N) + 1):
             if N % i == 0:
                 factors.append((i, N // i))
         
@@ -849,9 +1517,10 @@ class ArrayHeatmapDialog(QDialog):
             self.grid_options.append((22, 14))
             self.grid_options.append((14, 22))
         
+        seen = set(self.grid_options)
         for r, c in factors:
-            if (r,c) not in self.grid_options: self.grid_options.append((r, c))
-            if (c,r) not in self.grid_options and r != c: self.grid_options.append((c, r))
+            if (r,c) not in seen: self.grid_options.append((r, c)); seen.add((r, c))
+            if (c,r) not in seen: self.grid_options.append((c, r)); seen.add((c, r))
             
         for r, c in self.grid_options:
             self.spin_rows.addItem(f"{r} x {c}")
@@ -870,46 +1539,58 @@ class ArrayHeatmapDialog(QDialog):
         layout.addWidget(self.toolbar_hm)
         layout.addWidget(self.canvas_hm)
         
-        # 初始繪製
+        # 初始繪製 (影像與數值標籤於第一次繪製時建立，之後切換排列方式只更新既有圖元)
+        self._hm_im = None
+        self._hm_texts = []
         self.update_heatmap()
         
     def update_heatmap(self):
         """更新熱力圖"""
-        self.fig_hm.clear()
-        ax = self.fig_hm.add_subplot(111)
-        
         idx = self.spin_rows.currentIndex()
         if idx < 0 or idx >= len(self.grid_options):
             return
             
         rows, cols = self.grid_options[idx]
         
-        values = [d['value'] for d in self.array_data]
+        values = self._values
         # 確保數據依照 index 排序 (由小到大)
         # 假設 array_data 已經排序過
         
         try:
-            matrix = np.array(values).reshape(rows, cols)
-            
-            im = ax.imshow(matrix, cmap='coolwarm', interpolation='nearest') # 或 'bilinear'
+            matrix = values.reshape(rows, cols)
             
-            # Colorbar
-            self.fig_hm.colorbar(im, ax=ax)
+            if self._hm_im is None:
+                self.fig_hm.clear()
+                ax = self._hm_ax = self.fig_hm.add_subplot(111)
+                self._hm_im = ax.imshow(matrix, cmap=_CMAP_ARRAY, interpolation='nearest') # 或 'bilinear'
+                
+                # Colorbar
+                self.fig_hm.colorbar(self._hm_im, ax=ax)
+                
+                # 添加數值標籤 (如果格子夠少)；各點的標籤文字固定，只建立一次
+                if len(values) < 100:
+                    self._hm_texts = [ax.text(0, 0, label, ha="center", va="center", color="w", fontsize=8)
+                                      for label in np.char.mod('%.1f', values)]
+            else:
+                # 切換排列方式時數值與色階不變，只更新影像形狀與顯示範圍
+                self._hm_im.set_data(matrix)
+                self._hm_im.set_extent((-0.5, cols - 0.5, rows - 0.5, -0.5))
             
-            # 添加數值標籤 (如果格子夠少)
-            if len(values) < 100:
-                for i in range(rows):
-                    for j in range(cols):
-                        val = matrix[i, j]
-                        text = ax.text(j, i, f"{val:.1f}",
-                                       ha="center", va="center", color="w", fontsize=8)
+            # 第 k 個點位於 (列, 欄) = divmod(k, cols)
+            for k, text in enumerate(self._hm_texts):
+                i, j = divmod(k, cols)
+                text.set_position((j, i))
             
-            ax.set_title(f"熱力圖 ({rows}x{cols}) - 所有樣本平均值")
-            self.canvas_hm.draw()
+            self._hm_ax.set_title(f"熱力圖 ({rows}x{cols}) - 所有樣本平均值")
+            self.canvas_hm.draw_idle()
             
         except Exception as e:
+            self._hm_im = None
+            self._hm_texts = []
+            self.fig_hm.clear()
+            ax = self.fig_hm.add_subplot(111)
             ax.text(0.5, 0.5, f"繪圖錯誤: {str(e)}", ha='center')
-            self.canvas_hm.draw()
+            self.canvas_hm.draw_idle()
 
     def setup_stats_tab(self, parent_widget):
         """設定統計摘要"""
@@ -917,15 +1598,15 @@ class ArrayHeatmapDialog(QDialog):
         txt = QTextEdit()
         txt.setReadOnly(True)
         
-        values = np.array([d['value'] for d in self.array_data])
+        values = self._values
         if len(values) > 0:
             lines = []
             lines.append(f"測量專案：{self.group_name}")
             lines.append("══════════════════════════════")
             lines.append(f"總點數：{len(values)}")
             lines.append("")
-            lines.append(f"最大值 (Max)：{values.max():.4f}  (Index: {self.array_data[np.argmax(values)]['index']})")
-            lines.append(f"最小值 (Min)：{values.min():.4f}  (Index: {self.array_data[np.argmin(values)]['index']})")
+            lines.append(f"最大值 (Max)：{values.max():.4f}  (Index: {self._indices[values.argmax()]})")
+            lines.append(f"最小值 (Min)：{values.min():.4f}  (Index: {self._indices[values.argmin()]})")
             lines.append(f"峰谷值 (P-V)：{values.max() - values.min():.4f}")
             lines.append("")
             lines.append(f"平均值 (Mean)：{values.mean():.4f}")
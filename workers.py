@@ -4,6 +4,13 @@ Measurement Analyzer - 背景工作模組
 包含檔案載入執行緒
 """
 import os
+import io
+import csv
+import glob
+import hashlib
+import functools
+import concurrent.futures
+import numpy as np
 import pandas as pd
 import logging
 import traceback
@@ -12,9 +19,180 @@ from PyQt6.QtCore import QThread, pyqtSignal
 from config import AppConfig, DISPLAY_COLUMNS
 from parsers import find_header_row_and_date_csv, read_pdf_file
 
+# Optional pyarrow (Feather 快取與 CSV 匯出)
+try:
+    import pyarrow
+    import pyarrow.csv as pa_csv
+    import pyarrow.compute as pa_compute
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+_RESULT_CATEGORIES = ("OK", "FAIL", "---")
+# 數值欄位中代表無資料的佔位字串 (如未設定公差的 "---")，讀取時即視為 NaN，欄位仍由 C parser 推斷為 float64
+_CSV_NUMERIC_NA_VALUES = {c: ['---', '--', '-'] for c in (AppConfig.Columns.MEASURED, AppConfig.Columns.DESIGN,
+                                                           AppConfig.Columns.UPPER, AppConfig.Columns.LOWER)}
+_REQUIRED_COLUMNS = (AppConfig.Columns.NO, AppConfig.Columns.MEASURED, AppConfig.Columns.DESIGN)
+
+
+def _cache_path(filepath):
+    """
+    依 (路徑, 修改時間, 大小) 產生快取檔路徑
+    鍵值含 AppConfig.CACHE_VERSION：修改 _parse_one 的解析或判定邏輯時必須遞增，否則會讀到舊結果
+    """
+    st = os.stat(filepath)
+    raw = f"{AppConfig.CACHE_VERSION}|{AppConfig.VERSION}|{os.path.abspath(filepath)}|{st.st_mtime_ns}|{st.st_size}"
+    key = hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+    return os.path.join(AppConfig.CACHE_DIR, f"{key}.feather")
+
+
+def clear_cache():
+    """
+    刪除所有 Feather 快取檔，回傳刪除的檔案數
+    """
+    removed = 0
+    for path in glob.glob(os.path.join(AppConfig.CACHE_DIR, "*.feather")):
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError as e:
+            logging.warning("無法刪除快取 %s: %s", path, e)
+    return removed
+
+
+def _load_one(filepath):
+    """
+    讀取並判定單一檔案 (優先使用磁碟快取)
+    需為模組層級函式，才能交由 ProcessPoolExecutor 在子行程中執行；
+    未預期的例外會傳回主行程，由 FileLoaderThread 統一記錄。
+    Returns: (df, loaded, error) - df 為判定完成的資料 (或 None)，loaded 表示檔案是否成功讀取
+    """
+    if not HAS_PYARROW:
+        return _parse_one(filepath)
+    
+    try:
+        cache_path = _cache_path(filepath)
+        if os.path.exists(cache_path):
+            return pd.read_feather(cache_path), True, None
+    except Exception as e:
+        logging.warning("快取讀取失敗 %s: %s", filepath, e)
+        cache_path = None
+    
+    df, loaded, error = _parse_one(filepath)
+    if cache_path and df is not None and error is None:
+        # 先寫入暫存檔再更名，避免中斷時留下不完整的快取
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(AppConfig.CACHE_DIR, exist_ok=True)
+            df.reset_index(drop=True).to_feather(tmp_path, compression='lz4')
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            # 欄位型別混雜等無法序列化的情況僅略過快取
+            logging.warning("快取寫入失敗 %s: %s", filepath, e)
+            if os.path.exists(tmp_path): os.remove(tmp_path)
+    return df, loaded, error
+
+
+@functools.lru_cache(maxsize=256)
+def _normalize_columns(columns):
+    """
+    依原始欄位名稱計算標準化欄位名稱與缺少的必要欄位
+    (同批報告的欄位組成通常相同，結果以 lru_cache 快取，不必逐檔掃描欄位)
+    Returns: (new_columns, missing)
+    """
+    names = [str(c).strip() for c in columns]
+    if AppConfig.Columns.NO not in names:
+        for i, col in enumerate(names):
+            if 'No' in col and len(col) < 10:
+                names[i] = AppConfig.Columns.NO
+                break
+    missing = [c for c in _REQUIRED_COLUMNS if c not in names]
+    return tuple(names), tuple(missing)
+
+
+def _parse_one(filepath):
+    """
+    解析並判定單一檔案
+    Returns: (df, loaded, error)
+    """
+    filename = os.path.basename(filepath)
+    df = None
+    measure_time = None
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == '.pdf':
+        df, measure_time = read_pdf_file(filepath)
+    else:
+        header_idx, encoding, measure_time = find_header_row_and_date_csv(filepath)
+        if header_idx is not None:
+            # 不強制指定 dtype：含其他非數值內容的欄位保留為 object，由後續 pd.to_numeric 處理，不必重新讀檔
+            df = pd.read_csv(filepath, skiprows=header_idx, header=0, encoding=encoding,
+                             on_bad_lines='skip', index_col=False, engine='c',
+                             na_values=_CSV_NUMERIC_NA_VALUES)
+        else:
+            return None, False, f"{filename}: 無法識別標題列 (Header not found)"
+    
+    if df is None:
+        return None, False, f"{filename}: 讀取失敗或內容為空"
+    
+    columns, missing = _normalize_columns(tuple(df.columns))
+    df.columns = columns
+    if missing:
+        return None, True, f"{filename}: 缺少必要欄位 {list(missing)}"
+    
+    df = df.dropna(subset=[AppConfig.Columns.NO])
+    num_cols = [AppConfig.Columns.MEASURED, AppConfig.Columns.DESIGN, AppConfig.Columns.UPPER, AppConfig.Columns.LOWER]
+    for c in num_cols:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors='coerce')
+        else:
+            df[c] = 0.0
+    
+    # 判定邏輯：直接在 ndarray 上計算遮罩，最後一次寫入判定結果欄位
+    meas = df[AppConfig.Columns.MEASURED].to_numpy(dtype=float)
+    des = df[AppConfig.Columns.DESIGN].to_numpy(dtype=float)
+    up = df[AppConfig.Columns.UPPER].to_numpy(dtype=float)
+    lo = df[AppConfig.Columns.LOWER].to_numpy(dtype=float)
+    diff = meas - des
+    df[AppConfig.Columns.DIFF] = diff
+    
+    # 判定結果直接以 int8 類別代碼產生 (0=OK, 1=FAIL, 2=---)，不建立逐列字串陣列
+    codes = np.zeros(len(df), dtype=np.int8)
+    codes[(np.abs(des) < 0.000001) | np.isnan(up) | np.isnan(lo)] = 2
+    mask_tol_zero = (up == 0) & (lo == 0)
+    # NaN 比較結果為 False，已標記為 --- 的列不會被判為 FAIL
+    mask_fail = (codes == 0) & ~mask_tol_zero & ((diff > up) | (diff < lo))
+    categories = list(_RESULT_CATEGORIES)
+    
+    # 公差皆為 0 時沿用原始判斷 (優先於設計值為 0 的忽略判定)
+    orig_judge = None
+    if AppConfig.Columns.ORIGINAL_JUDGE in df.columns: orig_judge = AppConfig.Columns.ORIGINAL_JUDGE
+    elif AppConfig.Columns.ORIGINAL_JUDGE_PDF in df.columns: orig_judge = AppConfig.Columns.ORIGINAL_JUDGE_PDF
+    if orig_judge and mask_tol_zero.any():
+        orig = df[orig_judge].fillna("---").to_numpy(dtype=object)[mask_tol_zero]
+        categories += [v for v in pd.unique(orig) if v not in _RESULT_CATEGORIES]
+        codes[mask_tol_zero] = pd.Categorical(orig, categories=categories).codes
+    else:
+        codes[mask_tol_zero] = 2
+    codes[mask_fail] = 1
+    df[AppConfig.Columns.RESULT] = pd.Categorical.from_codes(codes, categories=categories)
+    
+    # 判定以 float64 完成後，數值欄位改以 float32 儲存 (量測值約 5 位有效數字，記憶體與頻寬減半)
+    for c in (AppConfig.Columns.MEASURED, AppConfig.Columns.DESIGN, AppConfig.Columns.DIFF,
+              AppConfig.Columns.UPPER, AppConfig.Columns.LOWER):
+        df[c] = df[c].astype(np.float32)
+    
+    df[AppConfig.Columns.FILE] = filename
+    df[AppConfig.Columns.TIME] = measure_time if measure_time else pd.NaT
+    if AppConfig.Columns.PROJECT not in df.columns: df[AppConfig.Columns.PROJECT] = ''
+    
+    cols = [c for c in DISPLAY_COLUMNS if c in df.columns]
+    return df[cols], True, None
+
+
 class FileLoaderThread(QThread):
-    """檔案讀取背景執行緒"""
+    """檔案讀取背景執行緒 (以多行程平行解析各檔案)"""
     progress_updated = pyqtSignal(int, str)
+    file_ready = pyqtSignal(int, object) # (檔案順序, DataFrame)，每個檔案解析完成即送出
     data_loaded = pyqtSignal(list, set, list) # [v2.5.3] Added errors list
     error_occurred = pyqtSignal(str)
 
@@ -22,98 +200,167 @@ class FileLoaderThread(QThread):
         super().__init__()
         self.file_paths = file_paths
         self._is_running = True
+        self._executor = None
 
     def run(self):
-        new_data_frames = []
         loaded_filenames = set()
         errors = [] # [v2.5.3] Collect errors details
-        for i, filepath in enumerate(self.file_paths):
-            if not self._is_running: break
-            filename = os.path.basename(filepath)
-            
-            # Get file size
-            try:
-                size_kb = os.path.getsize(filepath) / 1024
-                size_str = f"{size_kb:.1f}KB"
-            except Exception:
-                size_str = "Unknown"
+        if not self.file_paths:
+            self.data_loaded.emit([], loaded_filenames, errors)
+            return
+        
+        # 檔案之間互相獨立，PDF 解析為 CPU 密集工作，因此分散到多個行程
+        max_workers = min(os.cpu_count() or 1, len(self.file_paths))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as ex:
+            self._executor = ex
+            futures = {ex.submit(_load_one, fp): i for i, fp in enumerate(self.file_paths)}
+            for done, future in enumerate(concurrent.futures.as_completed(futures), start=1):
+                if not self._is_running:
+                    for f in futures: f.cancel()
+                    break
+                i = futures[future]
+                filepath = self.file_paths[i]
+                filename = os.path.basename(filepath)
+                
+                # Get file size
+                try:
+                    size_kb = os.path.getsize(filepath) / 1024
+                    size_str = f"{size_kb:.1f}KB"
+                except Exception:
+                    size_str = "Unknown"
                 
-            self.progress_updated.emit(i + 1, f"處理中: {filename} ({size_str})")
-            
-            df = None
-            measure_time = None
-            try:
-                ext = os.path.splitext(filename)[1].lower()
-                if ext == '.pdf':
-                    df, measure_time = read_pdf_file(filepath)
-                else:
-                    header_idx, encoding, measure_time = find_header_row_and_date_csv(filepath)
-                    if header_idx is not None:
-                        df = pd.read_csv(filepath, skiprows=header_idx, header=0, 
-                                       encoding=encoding, on_bad_lines='skip', index_col=False)
-                    else:
-                        errors.append(f"{filename}: 無法識別標題列 (Header not found)")
+                self.progress_updated.emit(done, f"已處理: {filename} ({size_str})")
                 
-                if df is not None:
-                    loaded_filenames.add(filename)
-                    df.columns = [str(c).strip() for c in df.columns]
-                    if AppConfig.Columns.NO not in df.columns:
-                        for col in df.columns:
-                            if 'No' in col and len(col) < 10:
-                                df.rename(columns={col: AppConfig.Columns.NO}, inplace=True)
-                                break
-                    required = [AppConfig.Columns.NO, AppConfig.Columns.MEASURED, AppConfig.Columns.DESIGN]
-                    if all(c in df.columns for c in required):
-                        df = df.dropna(subset=[AppConfig.Columns.NO])
-                        num_cols = [AppConfig.Columns.MEASURED, AppConfig.Columns.DESIGN, AppConfig.Columns.UPPER, AppConfig.Columns.LOWER]
-                        for c in num_cols:
-                            if c in df.columns:
-                                df[c] = pd.to_numeric(df[c], errors='coerce')
-                            else:
-                                df[c] = 0.0
-                        
-                        df[AppConfig.Columns.DIFF] = df[AppConfig.Columns.MEASURED] - df[AppConfig.Columns.DESIGN]
-                        df[AppConfig.Columns.RESULT] = "OK"
-                        
-                        mask_ignore = df[AppConfig.Columns.DESIGN].abs() < 0.000001
-                        df.loc[mask_ignore, AppConfig.Columns.RESULT] = "---"
-                        
-                        mask_tol_na = df[AppConfig.Columns.UPPER].isna() | df[AppConfig.Columns.LOWER].isna()
-                        df.loc[mask_tol_na, AppConfig.Columns.RESULT] = "---"
-                        
-                        mask_tol_zero = (df[AppConfig.Columns.UPPER] == 0) & (df[AppConfig.Columns.LOWER] == 0)
-                        orig_judge = None
-                        if AppConfig.Columns.ORIGINAL_JUDGE in df.columns: orig_judge = AppConfig.Columns.ORIGINAL_JUDGE
-                        elif AppConfig.Columns.ORIGINAL_JUDGE_PDF in df.columns: orig_judge = AppConfig.Columns.ORIGINAL_JUDGE_PDF
-                        
-                        if orig_judge:
-                            df.loc[mask_tol_zero, AppConfig.Columns.RESULT] = df.loc[mask_tol_zero, orig_judge].fillna("---")
-                        else:
-                            df.loc[mask_tol_zero, AppConfig.Columns.RESULT] = "---"
-                            
-                        mask_check = ~(mask_ignore | mask_tol_na | mask_tol_zero)
-                        mask_fail = mask_check & ((df[AppConfig.Columns.DIFF] > df[AppConfig.Columns.UPPER]) | (df[AppConfig.Columns.DIFF] < df[AppConfig.Columns.LOWER]))
-                        df.loc[mask_fail, AppConfig.Columns.RESULT] = "FAIL"
-                        
-                        df[AppConfig.Columns.FILE] = filename
-                        df[AppConfig.Columns.TIME] = measure_time if measure_time else pd.NaT
-                        if AppConfig.Columns.PROJECT not in df.columns: df[AppConfig.Columns.PROJECT] = ''
-                        
-                        cols = [c for c in DISPLAY_COLUMNS if c in df.columns]
-                        new_data_frames.append(df[cols])
-                    else:
-                         missing = [c for c in required if c not in df.columns]
-                         errors.append(f"{filename}: 缺少必要欄位 {missing}")
-                elif ext != '.pdf' and header_idx is None:
-                    pass # Already handled above
-                elif df is None:
-                    errors.append(f"{filename}: 讀取失敗或內容為空")
-
-            except Exception as e:
-                errors.append(f"{filename}: 系統錯誤 ({str(e)})")
-                logging.error(f"Error processing {filename}: {e}\n{traceback.format_exc()}")
-
-        self.data_loaded.emit(new_data_frames, loaded_filenames, errors)
+                try:
+                    df, loaded, error = future.result()
+                    if loaded: loaded_filenames.add(filename)
+                    if error: errors.append(error)
+                    if df is not None: self.file_ready.emit(i, df)
+                except Exception as e:
+                    errors.append(f"{filename}: 系統錯誤 ({str(e)})")
+                    logging.error("Error processing %s: %s\n%s", filename, e, traceback.format_exc())
+        
+        self._executor = None
+        
+        # 資料已由 file_ready 逐檔送出，data_loaded 僅作為完成通知
+        self.data_loaded.emit([], loaded_filenames, errors)
 
     def stop(self):
         self._is_running = False
+        # 立即取消尚未開始的檔案，不必等下一個檔案完成才在迴圈中取消
+        ex = self._executor
+        if ex is not None:
+            ex.shutdown(wait=False, cancel_futures=True)
+
+
+def _format_float_column(column):
+    """
+    浮點欄位轉字串，格式與 pandas to_csv 相同 (pandas 以 ndarray.astype(str) 轉換，float64 即 Python repr)
+    pyarrow 的最短表示法數字相同但格式不同：整數值寫成 "10" (pandas 為 "10.0")，
+    小於 1e-4 仍寫成小數 (1e-05 → "0.00001")、位數多的大數提早改用科學記號、-0.0 寫成 "-0"；後三類逐值改以 numpy 轉換
+    """
+    values = column.to_numpy(zero_copy_only=False)
+    if column.type != pyarrow.float64():
+        # float32 的科學記號門檻與 pyarrow 差異較多，整欄沿用 pandas 的轉換方式
+        strings = values.astype(str).astype(object)
+        strings[np.isnan(values)] = None
+        return pyarrow.array(strings, type=pyarrow.string())
+    text = column.cast(pyarrow.string())
+    integral = pa_compute.match_substring_regex(text, r'^-?\d+$')
+    text = pa_compute.if_else(integral, pa_compute.binary_join_element_wise(text, '.0', ''), text)
+    magnitude = np.abs(values)
+    # 空值轉為 NaN，以下比較皆為 False，維持空值
+    with np.errstate(invalid='ignore'):
+        differs = ((magnitude < 1e-4) & (values != 0)) | ((values == 0) & np.signbit(values)) \
+            | (pa_compute.match_substring(text, 'e').fill_null(False).to_numpy() & (magnitude < 1e16))
+    if differs.any():
+        strings = text.to_numpy(zero_copy_only=False)
+        strings[differs] = values[differs].astype(str)
+        text = pyarrow.array(strings, type=pyarrow.string())
+    return text
+
+
+def _format_timestamp_column(column):
+    """
+    時間欄位轉字串，格式與 pandas to_csv 相同：
+    全部為午夜時只輸出日期，否則依整欄最細的非零小數秒輸出 0/3/6/9 位小數
+    """
+    nanos = pa_compute.drop_null(column.cast(pyarrow.timestamp('ns'))).cast(pyarrow.int64()).to_numpy()
+    if not (nanos % 86_400_000_000_000).any():
+        return pa_compute.strftime(column.cast(pyarrow.timestamp('s'), safe=False), format="%Y-%m-%d")
+    sub_second = nanos % 1_000_000_000
+    if (sub_second % 1_000).any():
+        unit = 'ns'
+    elif (sub_second % 1_000_000).any():
+        unit = 'us'
+    elif sub_second.any():
+        unit = 'ms'
+    else:
+        unit = 's'
+    # strftime 的 %S 依時間單位附帶小數秒；依上列判斷轉換單位不會捨去資料
+    return pa_compute.strftime(column.cast(pyarrow.timestamp(unit), safe=False), format="%Y-%m-%d %H:%M:%S")
+
+
+def _to_csv_table(df):
+    """
+    轉為 Arrow Table 供 CSV 輸出，文字格式與 pandas to_csv 保持一致：
+    object 欄位 (No 可能混合數字與文字，含同類 Categorical) 先轉字串，布林欄位輸出 True/False，浮點與時間欄位另行格式化
+    """
+    converted = {}
+    for c in df.columns:
+        col = df[c]
+        if isinstance(col.dtype, pd.CategoricalDtype) and col.cat.categories.dtype == object:
+            col = col.astype(object)
+        if col.dtype == object:
+            converted[c] = col.where(col.isna(), col.astype(str))
+        elif col.dtype == bool:
+            converted[c] = col.astype(str)
+    if converted:
+        df = df.assign(**converted)
+    table = pyarrow.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pyarrow.types.is_floating(field.type):
+            table = table.set_column(i, field.name, _format_float_column(table.column(i)))
+        elif pyarrow.types.is_timestamp(field.type):
+            table = table.set_column(i, field.name, _format_timestamp_column(table.column(i)))
+    return table
+
+
+def write_csv(df, path):
+    """
+    匯出 CSV (UTF-8 BOM，供 Excel 正確辨識中文)
+    有 pyarrow 時以 C++ 序列化整份資料，無法轉換的欄位型別則退回 pandas
+    """
+    if HAS_PYARROW:
+        try:
+            table = _to_csv_table(df)
+            with open(path, 'wb') as f:
+                # pyarrow 的 "needed" 仍會替所有字串與標題加引號；為與 pandas 相同只在必要時加引號，
+                # 標題列以 csv 模組寫出，資料以 "none" 輸出 (含逗號、引號或換行的值會引發 ArrowInvalid，改由 pandas 匯出)
+                header = io.StringIO()
+                csv.writer(header, lineterminator='\n').writerow(df.columns)
+                f.write(b'\xef\xbb\xbf' + header.getvalue().encode('utf-8'))
+                pa_csv.write_csv(table, f, pa_csv.WriteOptions(include_header=False, quoting_style="none"))
+            return
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, pyarrow.ArrowNotImplementedError) as e:
+            logging.info("pyarrow 無法輸出，改用 pandas 匯出: %s", e)
+    df.to_csv(path, index=False, encoding='utf-8-sig')
+
+
+class CsvExportThread(QThread):
+    """CSV 匯出背景執行緒"""
+    export_finished = pyqtSignal(str)
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, df, path):
+        super().__init__()
+        self.df = df
+        self.path = path
+
+    def run(self):
+        try:
+            write_csv(self.df, self.path)
+            self.export_finished.emit(self.path)
+        except Exception as e:
+            logging.error("匯出失敗 %s: %s\n%s", self.path, e, traceback.format_exc())
+            self.error_occurred.emit(str(e))
@@ -6,6 +6,7 @@ Measurement Analyzer - XY 座標與陣列資料分析模組
 [v2.5.0] 2026/01/12
 """
 import re
+import functools
 import numpy as np
 import pandas as pd
 from dataclasses import dataclass, field
@@ -13,6 +14,16 @@ from typing import Literal, Dict, List, Tuple, Optional
 from enum import Enum
 
 
+# 測量專案名稱樣式 (每列都會比對，模組載入時編譯一次)
+_RE_XY = re.compile(r'^(.+?)\[(X座標|Y座標)\]$')
+_RE_ARR_NUM = re.compile(r'^(.+?)\[(\d+)\]$')
+_RE_ARR_TAG = re.compile(r'^(.+?)\[(平均|最大|最小|Max|Min|Avg)\]$', re.IGNORECASE)
+# 陣列彙總項 (平均) 的標記
+_AVG_TAGS = frozenset(('平均', 'Avg', 'avg'))
+
+_SQRT2 = np.sqrt(2.0)
+
+
 class MeasurementType(Enum):
     """測量資料類型"""
     SINGLE = "1D"      # 單值測項
@@ -56,9 +67,11 @@ class MeasurementGroup:
 # 解析函式
 # ============================================================
 
+@functools.lru_cache(maxsize=8192)
 def parse_xy_group(project_name: str) -> Tuple[str, str] | None:
     """
     解析測量專案名稱，提取 XY 群組 ID 與軸向
+    (結果以 lru_cache 快取，同名專案只比對一次 regex)
     
     支援格式：
     - 格式 A: 'NO.1_XY座標[X座標]' → ('NO.1_XY座標', 'X')
@@ -68,8 +81,7 @@ def parse_xy_group(project_name: str) -> Tuple[str, str] | None:
     Returns:
         (group_id, axis) or None
     """
-    pattern = r'^(.+?)\[(X座標|Y座標)\]$'
-    match = re.match(pattern, project_name)
+    match = _RE_XY.match(project_name)
     if match:
         group_id = match.group(1)
         axis = 'X' if 'X' in match.group(2) else 'Y'
@@ -77,9 +89,10 @@ def parse_xy_group(project_name: str) -> Tuple[str, str] | None:
     return None
 
 
+@functools.lru_cache(maxsize=8192)
 def parse_array_group(project_name: str) -> Tuple[str, int | str] | None:
     """
-    解析陣列式或特殊標記的測量專案
+    解析陣列式或特殊標記的測量專案 (以 lru_cache 快取)
     
     支援格式：
     - 數字索引: 'AA區平面度[5]'  → ('AA區平面度', 5)
@@ -89,14 +102,12 @@ def parse_array_group(project_name: str) -> Tuple[str, int | str] | None:
         (group_name, index_or_tag) or None
     """
     # 數字索引
-    pattern_num = r'^(.+?)\[(\d+)\]$'
-    match = re.match(pattern_num, project_name)
+    match = _RE_ARR_NUM.match(project_name)
     if match:
         return (match.group(1), int(match.group(2)))
     
     # 特殊標記 (平均等)
-    pattern_tag = r'^(.+?)\[(平均|最大|最小|Max|Min|Avg)\]$'
-    match = re.match(pattern_tag, project_name, re.IGNORECASE)
+    match = _RE_ARR_TAG.match(project_name)
     if match:
         return (match.group(1), match.group(2))
     
@@ -107,9 +118,11 @@ def parse_array_group(project_name: str) -> Tuple[str, int | str] | None:
 # 分類函式
 # ============================================================
 
+@functools.lru_cache(maxsize=8192)
 def classify_project_name(project_name: str) -> Tuple[MeasurementType, str, Optional[str]]:
     """
     分類測量專案名稱
+    (各檔案的測量專案名稱高度重複，結果皆為不可變 tuple，以 lru_cache 快取)
     
     Returns:
         (type, group_id, sub_info)
@@ -136,8 +149,8 @@ def classify_project_name(project_name: str) -> Tuple[MeasurementType, str, Opti
 # ============================================================
 
 def calculate_radial_deviation(dx: float, dy: float) -> float:
-    """計算徑向偏差 (歐氏距離)"""
-    return np.sqrt(dx**2 + dy**2)
+    """計算徑向偏差 (歐氏距離，dx/dy 可為純量或陣列)"""
+    return np.hypot(dx, dy)
 
 
 def calculate_radial_tolerance(tol_x: float, tol_y: float) -> float:
@@ -154,11 +167,11 @@ def calculate_radial_tolerance(tol_x: float, tol_y: float) -> float:
     """
     if abs(tol_x) > 0 and abs(tol_y) > 0:
         # 取較小值乘以 √2
-        return min(abs(tol_x), abs(tol_y)) * np.sqrt(2)
+        return min(abs(tol_x), abs(tol_y)) * _SQRT2
     elif abs(tol_x) > 0:
-        return abs(tol_x) * np.sqrt(2)
+        return abs(tol_x) * _SQRT2
     elif abs(tol_y) > 0:
-        return abs(tol_y) * np.sqrt(2)
+        return abs(tol_y) * _SQRT2
     return np.nan
 
 
@@ -173,6 +186,13 @@ def judge_2d_position(radial_deviation: float, radial_tolerance: float) -> str:
 # 資料處理函式
 # ============================================================
 
+def _column_values(df: pd.DataFrame, col: str, default=None) -> list:
+    """取出單一欄位為 Python list (欄位不存在時以 default 填滿)，逐列處理時不必以 iterrows 建立每列的 Series"""
+    if col in df.columns:
+        return df[col].tolist()
+    return [default] * len(df)
+
+
 def pair_xy_data(df: pd.DataFrame, no_col: str, project_col: str) -> Dict[str, MeasurementGroup]:
     """
     配對 XY 座標資料
@@ -187,8 +207,11 @@ def pair_xy_data(df: pd.DataFrame, no_col: str, project_col: str) -> Dict[str, M
     """
     groups: Dict[str, MeasurementGroup] = {}
     
-    for idx, row in df.iterrows():
-        project = str(row.get(project_col, ''))
+    rows = zip(_column_values(df, project_col, ''), _column_values(df, no_col, ''),
+               _column_values(df, '實測值', 0), _column_values(df, '設計值', 0),
+               _column_values(df, '上限公差', 0), _column_values(df, '下限公差', 0))
+    for project, no, measured, design, upper, lower in rows:
+        project = str(project)
         type_info, group_id, sub_info = classify_project_name(project)
         
         if type_info == MeasurementType.XY_COORD:
@@ -199,12 +222,12 @@ def pair_xy_data(df: pd.DataFrame, no_col: str, project_col: str) -> Dict[str, M
                 )
             
             item = MeasurementItem(
-                no=str(row.get(no_col, '')),
+                no=str(no),
                 project=project,
-                measured=float(row.get('實測值', 0) or 0),
-                design=float(row.get('設計值', 0) or 0),
-                upper_tol=float(row.get('上限公差', 0) or 0),
-                lower_tol=float(row.get('下限公差', 0) or 0)
+                measured=float(measured or 0),
+                design=float(design or 0),
+                upper_tol=float(upper or 0),
+                lower_tol=float(lower or 0)
             )
             
             if sub_info == 'X':
@@ -253,20 +276,23 @@ def classify_all_measurements(df: pd.DataFrame, no_col: str = 'No',
         except (ValueError, TypeError):
             return default
     
-    for idx, row in df.iterrows():
-        project = str(row.get(project_col, ''))
+    rows = zip(_column_values(df, project_col, ''), _column_values(df, no_col, ''),
+               _column_values(df, measured_col), _column_values(df, design_col),
+               _column_values(df, upper_col), _column_values(df, lower_col))
+    for project, no, measured, design, upper, lower in rows:
+        project = str(project)
         if not project or project == 'nan':
             continue
             
         type_info, group_id, sub_info = classify_project_name(project)
         
         item = MeasurementItem(
-            no=str(row.get(no_col, '')),
+            no=str(no),
             project=project,
-            measured=safe_float(row.get(measured_col)),
-            design=safe_float(row.get(design_col)),
-            upper_tol=safe_float(row.get(upper_col)),
-            lower_tol=safe_float(row.get(lower_col))
+            measured=safe_float(measured),
+            design=safe_float(design),
+            upper_tol=safe_float(upper),
+            lower_tol=safe_float(lower)
         )
         
         if group_id not in groups:
@@ -284,7 +310,7 @@ def classify_all_measurements(df: pd.DataFrame, no_col: str = 'No',
             else:
                 groups[group_id].y_item = item
         elif type_info == MeasurementType.ARRAY and isinstance(sub_info, str):
-            if sub_info in ('平均', 'Avg', 'avg'):
+            if sub_info in _AVG_TAGS:
                 groups[group_id].array_summary_item = item
     
     # 計算 2D 徑向值
@@ -316,9 +342,10 @@ def calculate_2d_stats(groups: List[MeasurementGroup]) -> Dict:
     Returns:
         統計結果字典
     """
-    radial_devs = [g.radial_deviation for g in groups if not np.isnan(g.radial_deviation)]
+    radial_devs = np.fromiter((g.radial_deviation for g in groups), dtype=np.float64, count=len(groups))
+    radial_devs = radial_devs[~np.isnan(radial_devs)]
     
-    if not radial_devs:
+    if len(radial_devs) == 0:
         return {
             'count': 0,
             'mean_radial': np.nan,
@@ -329,10 +356,10 @@ def calculate_2d_stats(groups: List[MeasurementGroup]) -> Dict:
     
     return {
         'count': len(radial_devs),
-        'mean_radial': np.mean(radial_devs),
-        'max_radial': np.max(radial_devs),
-        'min_radial': np.min(radial_devs),
-        'std_radial': np.std(radial_devs, ddof=1) if len(radial_devs) > 1 else 0
+        'mean_radial': radial_devs.mean(),
+        'max_radial': radial_devs.max(),
+        'min_radial': radial_devs.min(),
+        'std_radial': radial_devs.std(ddof=1) if len(radial_devs) > 1 else 0
     }
 
 
@@ -346,16 +373,17 @@ def calculate_array_stats(items: List[MeasurementItem]) -> Dict:
     if not items:
         return {'peak_valley': np.nan, 'mean_abs_dev': np.nan}
     
-    values = [item.measured for item in items]
+    values = np.fromiter((item.measured for item in items), dtype=np.float64, count=len(items))
+    max_val, min_val = values.max(), values.min()
     
     return {
         'count': len(values),
-        'peak_valley': max(values) - min(values),  # P-V 值
-        'mean_abs_dev': np.mean([abs(v) for v in values]),
-        'max_val': max(values),
-        'min_val': min(values),
-        'mean_val': np.mean(values),
-        'std_val': np.std(values, ddof=1) if len(values) > 1 else 0
+        'peak_valley': max_val - min_val,  # P-V 值
+        'mean_abs_dev': np.abs(values).mean(),
+        'max_val': max_val,
+        'min_val': min_val,
+        'mean_val': values.mean(),
+        'std_val': values.std(ddof=1) if len(values) > 1 else 0
     }
 
 
@@ -380,102 +408,60 @@ def merge_xy_stats_from_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     measured_col = AppConfig.Columns.MEASURED
     design_col = AppConfig.Columns.DESIGN
     upper_col = AppConfig.Columns.UPPER
-    lower_col = AppConfig.Columns.LOWER
-    result_col = AppConfig.Columns.RESULT
     file_col = AppConfig.Columns.FILE
     
-    # 收集所有 XY 座標組資料
-    xy_data: Dict[str, Dict] = {}  # group_id -> {x_rows: [], y_rows: []}
-    
-    for idx, row in df.iterrows():
-        project = str(row.get(project_col, ''))
-        type_info, group_id, axis = classify_project_name(project)
-        
-        if type_info != MeasurementType.XY_COORD:
-            continue
-        
-        if group_id not in xy_data:
-            xy_data[group_id] = {
-                'x_rows': [],
-                'y_rows': [],
-                'no': row.get(no_col, ''),
-                'upper_tol': 0,
-                'lower_tol': 0
-            }
-        
-        # 取得公差值
-        upper = pd.to_numeric(row.get(upper_col), errors='coerce')
-        lower = pd.to_numeric(row.get(lower_col), errors='coerce')
-        if not np.isnan(upper):
-            xy_data[group_id]['upper_tol'] = upper
-        if not np.isnan(lower):
-            xy_data[group_id]['lower_tol'] = lower
-        
-        # 分類 X/Y
-        if axis == 'X':
-            xy_data[group_id]['x_rows'].append(row)
-        else:
-            xy_data[group_id]['y_rows'].append(row)
+    # 以向量化 regex 取出 XY 座標列的 (群組, 軸向)，與 parse_xy_group 的規則相同
+    if project_col not in df.columns:
+        return pd.DataFrame()
+    parts = df[project_col].astype(str).str.extract(_RE_XY)
+    is_xy = parts[0].notna().to_numpy()
+    if not is_xy.any():
+        return pd.DataFrame()
+    sub = df[is_xy]
+    xy = pd.DataFrame({
+        'group_id': parts[0].to_numpy()[is_xy],
+        'axis': parts[1].str[0].to_numpy()[is_xy],
+        'file': sub[file_col].to_numpy() if file_col in df.columns else None,
+        'no': sub[no_col].to_numpy() if no_col in df.columns else '',
+        'dev': (pd.to_numeric(sub[measured_col], errors='coerce').to_numpy(dtype=np.float64)
+                - pd.to_numeric(sub[design_col], errors='coerce').to_numpy(dtype=np.float64)),
+        'upper': pd.to_numeric(sub[upper_col], errors='coerce').to_numpy(dtype=np.float64),
+    })
+    
+    # 各組的 No 取第一列；公差取最後一個有效值 (皆無效時為 0)
+    group_no = xy.drop_duplicates('group_id').set_index('group_id')['no']
+    upper_tol = xy.groupby('group_id', sort=False)['upper'].last().fillna(0)
+    
+    # 同組同軸同檔名以最後一列為準，再按檔案名稱配對 X/Y
+    last = xy.drop_duplicates(['group_id', 'axis', 'file'], keep='last')
+    pairs = last[last['axis'] == 'X'].merge(last[last['axis'] == 'Y'], on=['group_id', 'file'], suffixes=('_x', '_y'))
+    pairs = pairs[pairs['dev_x'].notna() & pairs['dev_y'].notna()]
+    pairs = pairs.assign(radial=calculate_radial_deviation(pairs['dev_x'].to_numpy(), pairs['dev_y'].to_numpy()))
     
     # 計算每組的徑向統計
-    merged_stats = []
+    radial_tol = upper_tol.map(lambda t: calculate_radial_tolerance(t, t))  # 假設 X/Y 公差相同
+    pairs = pairs.assign(ng=pairs['radial'].to_numpy() > radial_tol.reindex(pairs['group_id']).to_numpy())
+    agg = pairs.groupby('group_id', sort=False).agg(
+        count=('radial', 'size'), ng=('ng', 'sum'),
+        mean=('radial', 'mean'), max=('radial', 'max'), min=('radial', 'min'))
     
-    for group_id, data in xy_data.items():
-        x_rows = data['x_rows']
-        y_rows = data['y_rows']
-        
-        if not x_rows or not y_rows:
-            continue
-        
-        # 按檔案名稱配對 X/Y 資料
-        x_by_file = {row.get(file_col): row for row in x_rows}
-        y_by_file = {row.get(file_col): row for row in y_rows}
-        
-        radial_devs = []
-        ng_count = 0
-        
-        for file_name in x_by_file.keys():
-            if file_name not in y_by_file:
-                continue
-            
-            x_row = x_by_file[file_name]
-            y_row = y_by_file[file_name]
-            
-            x_measured = pd.to_numeric(x_row.get(measured_col), errors='coerce')
-            x_design = pd.to_numeric(x_row.get(design_col), errors='coerce')
-            y_measured = pd.to_numeric(y_row.get(measured_col), errors='coerce')
-            y_design = pd.to_numeric(y_row.get(design_col), errors='coerce')
-            
-            if any(np.isnan([x_measured, x_design, y_measured, y_design])):
-                continue
-            
-            dx = x_measured - x_design
-            dy = y_measured - y_design
-            radial = calculate_radial_deviation(dx, dy)
-            radial_devs.append(radial)
-            
-            # 判定徑向是否超標
-            radial_tol = calculate_radial_tolerance(
-                data['upper_tol'], 
-                data['upper_tol']  # 假設 X/Y 公差相同
-            )
-            if radial > radial_tol:
-                ng_count += 1
-        
-        if not radial_devs:
+    merged_stats = []
+    for group_id in upper_tol.index:
+        if group_id not in agg.index:
             continue
+        stats = agg.loc[group_id]
         
         # 統計結果
         merged_stats.append({
-            'No': data['no'],
+            'No': group_no[group_id],
             '測量專案': group_id,
             '類型': '2D',
-            '樣本數': len(radial_devs),
-            'NG數': ng_count,
-            '徑向偏差_平均': np.mean(radial_devs),
-            '徑向偏差_最大': np.max(radial_devs),
-            '徑向偏差_最小': np.min(radial_devs),
-            '徑向公差': calculate_radial_tolerance(data['upper_tol'], data['upper_tol']),
+            '樣本數': int(stats['count']),
+            'NG數': int(stats['ng']),
+            '徑向偏差_平均': stats['mean'],
+            '徑向偏差_最大': stats['max'],
+            '徑向偏差_最小': stats['min'],
+            '徑向公差': radial_tol[group_id],
             '_x_project': f"{group_id}[X座標]",
             '_y_project': f"{group_id}[Y座標]"
         })
@@ -521,14 +507,18 @@ def calculate_2d_suggested_tolerance(radial_vals: np.ndarray, target_yield: floa
     if len(radial_vals) < 2:
         return {'suggested_tol': np.nan, 'sigma': np.nan, 'reliability': 'insufficient_data'}
     
-    # 清除 NaN
-    radial_vals = radial_vals[~np.isnan(radial_vals)]
-    if len(radial_vals) == 0:
-        return {'suggested_tol': np.nan, 'sigma': np.nan, 'reliability': 'no_data'}
-
     # 1. 參數估計 (使用 RMS 方法，這樣可以包含中心偏移的影響)
-    # sigma_hat = sqrt( sum(r^2) / (2n) )
-    mean_sq = np.mean(radial_vals**2)
+    # sigma_hat = sqrt( sum(r^2) / (2n) )；平方和以內積一次算出，不建立 r^2 暫存陣列
+    sum_sq = np.dot(radial_vals, radial_vals)
+    n = len(radial_vals)
+    if np.isnan(sum_sq):
+        # 含 NaN 時才建立遮罩清除 NaN 後重算 (無 NaN 的一般情況只掃描一次)
+        radial_vals = radial_vals[~np.isnan(radial_vals)]
+        n = len(radial_vals)
+        if n == 0:
+            return {'suggested_tol': np.nan, 'sigma': np.nan, 'reliability': 'no_data'}
+        sum_sq = np.dot(radial_vals, radial_vals)
+    mean_sq = sum_sq / n
     sigma = np.sqrt(mean_sq / 2)
     
     if sigma <= 0:
@@ -542,7 +532,7 @@ def calculate_2d_suggested_tolerance(radial_vals: np.ndarray, target_yield: floa
         suggested_tol = np.nan
         
     reliability = 'ok'
-    if len(radial_vals) < 30:
+    if n < 30:
         reliability = 'small_sample'
         
     return {